@@ -4,107 +4,326 @@ FastAPI server to expose TTS functionality
 """
 
 import os
+import sys
+import gc
 import shutil
-import json
+import queue
+import logging
+import asyncio
+import functools
+import importlib.util
+import tempfile
+import threading
 import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
 import uvicorn
 
-from tts_playground import get_tts_engine
+from tts_playground import TTSBase, get_tts_engine
+from tts_playground.batching import BatchScheduler
+
+
+# Log records are handed to a background listener thread through a queue, so
+# request handling never blocks on writing to stdout
+logger = logging.getLogger("api")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+
+# Request bodies are only read and logged when explicitly requested
+DEBUG_BODIES = os.getenv("DEBUG_BODIES") == "1"
+# Output names are reused when audio is regenerated (same text prefix or
+# output_filename), so clients must revalidate every time; the ETag turns an
+# unchanged file into a bodyless 304
+DOWNLOAD_CACHE_CONTROL = "no-cache"
+
+# Upper bound on how much of an error response the middleware holds for logging
+MAX_ERROR_CAPTURE = 16 * 1024
 
 
 class RequestResponseLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log raw requests and error responses"""
+    """Middleware to log requests (at DEBUG level) and error responses"""
     
     async def dispatch(self, request: Request, call_next):
-        request_time = time.strftime("%Y-%m-%d %H:%M:%S")
         method = request.method
         url = str(request.url)
-        headers = dict(request.headers)
         
-        body = await request.body()
+        if logger.isEnabledFor(logging.DEBUG):
+            headers = {k: v for k, v in request.headers.items()
+                       if k.lower() not in ("authorization", "cookie")}
+            logger.debug("Request: %s %s headers=%s", method, url, headers)
+            
+            if DEBUG_BODIES:
+                body = await request.body()
+                self._log_body(request.headers.get("content-type", ""), body)
+                
+                async def receive():
+                    return {"type": "http.request", "body": body}
+                request._receive = receive
         
-        # Check if this is a multipart/form-data request (file upload)
-        content_type = headers.get("content-type", "")
-        is_multipart = "multipart/form-data" in content_type
+        response = await call_next(request)
         
-        print("\n" + "=" * 60)
-        print(f"[{request_time}] RAW REQUEST")
-        print("=" * 60)
-        print(f"Method: {method}")
-        print(f"URL: {url}")
-        print(f"Headers: {json.dumps({k: v for k, v in headers.items() if k.lower() not in ['authorization', 'cookie']}, indent=2)}")
+        if response.status_code < 400:
+            return response
         
-        if body:
-            if is_multipart:
-                print(f"Body: [multipart/form-data, {len(body)} bytes - binary content not logged]")
-            else:
-                try:
-                    body_str = body.decode("utf-8")
-                    try:
-                        body_json = json.loads(body_str)
-                        print(f"Body: {json.dumps(body_json, indent=2, ensure_ascii=False)}")
-                    except json.JSONDecodeError:
-                        print(f"Body: {body_str[:500]}{'...' if len(body_str) > 500 else ''}")
-                except UnicodeDecodeError:
-                    print(f"Body: [binary content, {len(body)} bytes]")
-        print("=" * 60)
+        if response.headers.get("content-type", "").startswith("audio/"):
+            logger.warning("Error response %s for %s %s: [audio body not logged]",
+                           response.status_code, method, url)
+            return response
         
-        async def receive():
-            return {"type": "http.request", "body": body}
-        request._receive = receive
+        # Capture only a bounded prefix for logging; the rest of the body is
+        # streamed through untouched rather than buffered in memory
+        body_iterator = response.body_iterator
+        captured = bytearray()
+        async for chunk in body_iterator:
+            captured.extend(chunk)
+            if len(captured) >= MAX_ERROR_CAPTURE:
+                break
         
-        response = await call_next(request)
+        response_str = bytes(captured[:500]).decode("utf-8", errors="replace")
+        logger.warning(
+            "Error response %s for %s %s: %s%s", response.status_code, method, url,
+            response_str, "..." if len(captured) > 500 else ""
+        )
         
-        if response.status_code >= 400:
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
-            
-            response_str = response_body.decode("utf-8") if response_body else ""
-            
-            print("\n" + "!" * 60)
-            print(f"[{request_time}] ERROR RESPONSE ({response.status_code})")
-            print("!" * 60)
-            print(f"Status: {response.status_code}")
-            if response_str:
-                try:
-                    response_json = json.loads(response_str)
-                    print(f"Response: {json.dumps(response_json, indent=2, ensure_ascii=False)}")
-                except json.JSONDecodeError:
-                    print(f"Response: {response_str[:500]}{'...' if len(response_str) > 500 else ''}")
-            print("!" * 60 + "\n")
-            
-            return Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type
-            )
+        async def replay():
+            yield bytes(captured)
+            async for chunk in body_iterator:
+                yield chunk
         
-        return response
+        return StreamingResponse(
+            replay(),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type
+        )
+    
+    @staticmethod
+    def _log_body(content_type: str, body: bytes):
+        if not body:
+            return
+        if "multipart/form-data" in content_type:
+            logger.debug("Body: [multipart/form-data, %d bytes - binary content not logged]", len(body))
+            return
+        try:
+            # orjson parses the raw bytes and emits UTF-8 directly, so Hindi
+            # text is never escaped or round-tripped through str
+            logger.debug("Body: %s", orjson.dumps(orjson.loads(body), option=orjson.OPT_INDENT_2).decode())
+            return
+        except orjson.JSONDecodeError:
+            pass
+        try:
+            body_str = body.decode("utf-8")
+        except UnicodeDecodeError:
+            logger.debug("Body: [binary content, %d bytes]", len(body))
+            return
+        logger.debug("Body: %s%s", body_str[:500], "..." if len(body_str) > 500 else "")
 
 
 app = FastAPI(
     title="TTS Playground API",
     description="REST API for Text-to-Speech with XTTS-Hindi and Indic Parler models",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(RequestResponseLoggingMiddleware)
 
-engines = {}
+# Loaded engines in least-recently-used order; MAX_RESIDENT_MODELS=0 means unbounded
+engines: "OrderedDict[str, TTSBase]" = OrderedDict()
+_VALID_MODELS = frozenset({"xtts-hindi", "indic-parler", "kokoro", "f5-hindi", "vibevoice-hindi"})
+_VOICE_CLONING_MODELS = frozenset({"xtts-hindi", "f5-hindi", "vibevoice-hindi"})
+# Model name -> its folder under output/
+_CLEANUP_DIR_MAP = {m: m.replace("-", "_") for m in
+                    ("xtts-hindi", "indic-parler", "kokoro", "f5-hindi", "vibevoice-hindi")}
+_init_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+MAX_RESIDENT_MODELS = int(os.getenv("MAX_RESIDENT_MODELS", "0"))
 UPLOAD_DIR = Path("temp_uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Uploads left behind by crashed or killed requests are swept periodically
+UPLOAD_MAX_AGE = 3600
+UPLOAD_SWEEP_INTERVAL = 600
+
+
+def _write_all(fd: int, data: bytes):
+    """Write data to a raw file descriptor, retrying on short writes"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+async def save_upload(upload: UploadFile) -> Path:
+    """Stream an uploaded file into UPLOAD_DIR in fixed-size chunks"""
+    # Only the extension of the client-supplied name is kept, under a unique
+    # server-side name, so uploads can neither collide nor escape UPLOAD_DIR
+    suffix = Path(upload.filename or "").suffix[:8]
+    loop = asyncio.get_running_loop()
+    fd, name = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=suffix)
+    try:
+        # Reserve the full extent up front when the size is known so the
+        # filesystem allocates it once instead of growing it per chunk
+        size = getattr(upload, "size", None)
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass
+        # Chunks go straight to the descriptor, skipping the buffered file layer
+        written = 0
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await loop.run_in_executor(None, _write_all, fd, chunk)
+            written += len(chunk)
+        if size and written != size:
+            os.ftruncate(fd, written)
+    except Exception:
+        os.close(fd)
+        os.unlink(name)
+        raise
+    os.close(fd)
+    return Path(name)
+
+
+def _sanitize_char(c: str) -> Optional[str]:
+    """Replacement for one filename character: itself, '_' for a space, or None to drop it"""
+    if c == ' ':
+        return '_'
+    if c.isalnum() or c in ('-', '_'):
+        return c
+    return None
+
+
+class _SanitizeTable(dict):
+    """
+    str.translate table, precomputed for ASCII and Devanagari
+
+    Other code points are decided on each lookup without being stored, so
+    arbitrary client text cannot grow the table.
+    """
+
+    def __missing__(self, codepoint):
+        return _sanitize_char(chr(codepoint))
+
+
+_SANITIZE_TABLE = _SanitizeTable(
+    (cp, _sanitize_char(chr(cp)))
+    for cp in (*range(0x80), *range(0x0900, 0x0980))
+)
+
+
+def _safe_filename(text: str) -> str:
+    """Derive an output file stem from the first 30 characters of text"""
+    # Same rules as before (letters/digits in any script, '-', '_', spaces
+    # turned into '_'), applied in one translate pass instead of per-char joins
+    return text[:30].translate(_SANITIZE_TABLE)
+
+
+def _sweep_uploads(max_age: float) -> int:
+    """Delete files in UPLOAD_DIR older than max_age seconds"""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = os.scandir(UPLOAD_DIR)
+    except OSError:
+        return 0
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+async def _upload_sweeper():
+    """Background task that periodically removes stale uploads"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(UPLOAD_SWEEP_INTERVAL)
+        removed = await loop.run_in_executor(None, _sweep_uploads, UPLOAD_MAX_AGE)
+        if removed:
+            logger.info("Removed %d stale uploads", removed)
+
+
+def _size_or_none(path) -> Optional[int]:
+    """Return the size of path in bytes, or None if it cannot be stat'ed"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def _run_synthesis_batch(key, items):
+    """Synthesize a batch of (engine, params) items that share a model and parameters"""
+    # Items differ only in text and output path, so the engine can run them
+    # together (F5 samples them in one padded forward pass)
+    tts, shared = items[0]
+    shared = {k: v for k, v in shared.items() if k not in ("text", "output_path")}
+    return tts.synthesize_many(
+        [params["text"] for _, params in items],
+        [params["output_path"] for _, params in items],
+        **shared
+    )
+
+
+# Model loading and synthesis are blocking, so they run in a bounded pool of
+# worker threads to keep the event loop free for other requests
+executor = ThreadPoolExecutor(max_workers=int(os.getenv("TTS_WORKERS", "2")))
+
+# Concurrent /synthesize requests with the same model, parameters and similar
+# text length are grouped and run together in a worker thread instead of
+# serializing on the event loop
+_model_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def model_concurrency(model_name: str) -> int:
+    """Concurrent synthesis calls allowed for one model"""
+    # e.g. TTS_CONCURRENCY_XTTS_HINDI=2; one call at a time by default
+    env = f"TTS_CONCURRENCY_{model_name.upper().replace('-', '_')}"
+    return max(1, int(os.getenv(env, "1")))
+
+
+def model_semaphore(model_name: str) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent synthesis calls for one model"""
+    sem = _model_semaphores.get(model_name)
+    if sem is None:
+        sem = _model_semaphores[model_name] = asyncio.Semaphore(model_concurrency(model_name))
+    return sem
+
+
+def model_dtype(model_name: str) -> Optional[str]:
+    """Weight precision for a model from TTS_DTYPE_<MODEL> or TTS_DTYPE (unset: engine default)"""
+    env = f"TTS_DTYPE_{model_name.upper().replace('-', '_')}"
+    return os.getenv(env) or os.getenv("TTS_DTYPE") or None
+
+
+batcher = BatchScheduler(
+    _run_synthesis_batch,
+    max_batch_size=int(os.getenv("TTS_BATCH_MAX_SIZE", "0")) or None,
+    executor=executor,
+    limiter=lambda key: model_semaphore(key[0])
+)
 
 
 class TTSRequest(BaseModel):
     """Request model for TTS synthesis"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     text: str = Field(..., description="Text to convert to speech")
     model: str = Field("indic-parler", description="Model: 'xtts-hindi', 'indic-parler', 'kokoro', 'f5-hindi', or 'vibevoice-hindi'")
     output_filename: Optional[str] = Field(None, description="Output filename")
@@ -121,6 +340,8 @@ class TTSRequest(BaseModel):
 
 class TTSResponse(BaseModel):
     """Response model for TTS synthesis"""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     output_path: Optional[str] = None
@@ -130,22 +351,58 @@ class TTSResponse(BaseModel):
 
 class ModelInfo(BaseModel):
     """Model information"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     description: str
     languages: List[str]
     features: List[str]
+    dtype: Optional[str] = None
     initialized: bool
 
 
+WARMUP_TEXT = "नमस्ते दुनिया"
+
+
+def warm_up_engine(tts: TTSBase):
+    """Run a throwaway synthesis to trigger lazy initialization"""
+    tts.synthesize(text=WARMUP_TEXT, output_path=None)
+    tts.warmup_done = True
+
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+
 @app.on_event("startup")
 async def startup_event():
+    global _sweeper_task
     print("TTS Playground API starting...")
-    print("Models will be initialized on first use")
+    _sweeper_task = asyncio.create_task(_upload_sweeper())
+    preload = [m.strip() for m in os.getenv("TTS_PRELOAD", "").split(",") if m.strip()]
+    if not preload:
+        print("Models will be initialized on first use")
+        return
+    
+    loop = asyncio.get_running_loop()
+    for model_name in preload:
+        print(f"Preloading {model_name}...")
+        try:
+            tts = await get_engine(model_name)
+            await loop.run_in_executor(executor, warm_up_engine, tts)
+            print(f"{model_name} preloaded and warmed up")
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"Warning: could not preload {model_name}: {detail}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("Shutting down TTS Playground API...")
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+    await batcher.shutdown()
+    executor.shutdown(wait=False)
+    _log_listener.stop()
     if UPLOAD_DIR.exists():
         shutil.rmtree(UPLOAD_DIR)
 
@@ -158,6 +415,7 @@ async def root():
         "models": ["xtts-hindi", "indic-parler", "kokoro", "f5-hindi", "vibevoice-hindi"],
         "endpoints": {
             "POST /synthesize": "Synthesize speech from text",
+            "POST /synthesize-stream": "Stream synthesized speech as it is generated",
             "POST /synthesize-with-voice": "Synthesize with voice cloning (XTTS, F5-Hindi, VibeVoice)",
             "GET /models": "List available models",
             "GET /speakers": "Get speakers/voices for a model",
@@ -177,200 +435,336 @@ async def health_check():
             "kokoro": "kokoro" in engines,
             "f5-hindi": "f5-hindi" in engines,
             "vibevoice-hindi": "vibevoice-hindi" in engines
-        }
+        },
+        "models_resident": list(engines),
+        "models_warmed_up": {
+            name: getattr(tts, "warmup_done", False) for name, tts in engines.items()
+        },
+        "models_dtype": {name: tts.dtype or "default" for name, tts in engines.items()}
     }
 
 
+# Static model metadata; only the "initialized" flag changes at runtime
+MODEL_INFO = [
+    {
+        "name": "xtts-hindi",
+        "description": "XTTS-Hindi with voice cloning support",
+        "languages": ["hi"],
+        "features": ["voice_cloning", "high_quality"]
+    },
+    {
+        "name": "indic-parler",
+        "description": "Indic Parler TTS with 22 Indian languages",
+        "languages": ["hi", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa", "or", "as", "en", "ne", "sa", "sd", "ks", "doi", "mai", "mni", "sat", "brx", "gom"],
+        "features": ["voice_description", "multilingual", "22_languages"]
+    },
+    {
+        "name": "kokoro",
+        "description": "Kokoro TTS - Fast, lightweight Hindi TTS (82M model)",
+        "languages": ["hi"],
+        "features": ["fast", "lightweight", "multiple_voices"]
+    },
+    {
+        "name": "f5-hindi",
+        "description": "F5-Hindi TTS - High-quality voice cloning for Hindi (SPRINGLab)",
+        "languages": ["hi"],
+        "features": ["voice_cloning", "high_quality", "24khz"]
+    },
+    {
+        "name": "vibevoice-hindi",
+        "description": "VibeVoice Hindi 1.5B - Frontier TTS with voice cloning and multi-speaker support",
+        "languages": ["hi"],
+        "features": ["voice_cloning", "multi_speaker", "long_form", "expressive", "1.5B_params"]
+    }
+]
+
+# Each entry is serialized once without its closing brace, so a request only
+# appends the current "initialized" flag (dtype is fixed by the environment)
+_MODEL_JSON_PREFIXES = [
+    (info["name"], orjson.dumps({**info, "dtype": model_dtype(info["name"])})[:-1])
+    for info in MODEL_INFO
+]
+
+_VOICES_JSON = orjson.dumps({
+    "model": "indic-parler",
+    "example_descriptions": {
+        "female_calm": "A female speaker with a calm and clear voice.",
+        "male_calm": "A male speaker with a calm and clear voice.",
+        "female_expressive": "A female speaker with an expressive and energetic voice.",
+        "male_expressive": "A male speaker with an expressive and energetic voice.",
+    },
+    "supported_languages": {
+        "as": "Assamese", "bn": "Bengali", "brx": "Bodo", "doi": "Dogri",
+        "en": "English", "gom": "Konkani", "gu": "Gujarati", "hi": "Hindi",
+        "kn": "Kannada", "ks": "Kashmiri", "mai": "Maithili", "ml": "Malayalam",
+        "mni": "Manipuri", "mr": "Marathi", "ne": "Nepali", "or": "Odia",
+        "pa": "Punjabi", "sa": "Sanskrit", "sat": "Santali", "sd": "Sindhi",
+        "ta": "Tamil", "te": "Telugu"
+    }
+})
+
+
 @app.get("/models", response_model=List[ModelInfo])
 async def list_models():
-    return [
-        ModelInfo(
-            name="xtts-hindi",
-            description="XTTS-Hindi with voice cloning support",
-            languages=["hi"],
-            features=["voice_cloning", "high_quality"],
-            initialized="xtts-hindi" in engines
-        ),
-        ModelInfo(
-            name="indic-parler",
-            description="Indic Parler TTS with 22 Indian languages",
-            languages=["hi", "ta", "te", "bn", "mr", "gu", "kn", "ml", "pa", "or", "as", "en", "ne", "sa", "sd", "ks", "doi", "mai", "mni", "sat", "brx", "gom"],
-            features=["voice_description", "multilingual", "22_languages"],
-            initialized="indic-parler" in engines
-        ),
-        ModelInfo(
-            name="kokoro",
-            description="Kokoro TTS - Fast, lightweight Hindi TTS (82M model)",
-            languages=["hi"],
-            features=["fast", "lightweight", "multiple_voices"],
-            initialized="kokoro" in engines
-        ),
-        ModelInfo(
-            name="f5-hindi",
-            description="F5-Hindi TTS - High-quality voice cloning for Hindi (SPRINGLab)",
-            languages=["hi"],
-            features=["voice_cloning", "high_quality", "24khz"],
-            initialized="f5-hindi" in engines
-        ),
-        ModelInfo(
-            name="vibevoice-hindi",
-            description="VibeVoice Hindi 1.5B - Frontier TTS with voice cloning and multi-speaker support",
-            languages=["hi"],
-            features=["voice_cloning", "multi_speaker", "long_form", "expressive", "1.5B_params"],
-            initialized="vibevoice-hindi" in engines
-        )
-    ]
+    body = b",".join(
+        prefix + (b',"initialized":true}' if name in engines else b',"initialized":false}')
+        for name, prefix in _MODEL_JSON_PREFIXES
+    )
+    return Response(content=b"[" + body + b"]", media_type="application/json")
 
 
 @app.get("/voices")
 async def get_voice_descriptions():
-    return {
+    return Response(content=_VOICES_JSON, media_type="application/json")
+
+
+_SPEAKERS = {
+    "kokoro": {
+        "model": "kokoro",
+        "voices": {
+            "hf_alpha": "Hindi Female Alpha",
+            "hf_beta": "Hindi Female Beta",
+            "hm_omega": "Hindi Male Omega",
+            "hm_psi": "Hindi Male Psi"
+        },
+        "total": 4
+    },
+    "indic-parler": {
         "model": "indic-parler",
-        "example_descriptions": {
+        "voices": {
             "female_calm": "A female speaker with a calm and clear voice.",
             "male_calm": "A male speaker with a calm and clear voice.",
             "female_expressive": "A female speaker with an expressive and energetic voice.",
             "male_expressive": "A male speaker with an expressive and energetic voice.",
         },
-        "supported_languages": {
-            "as": "Assamese", "bn": "Bengali", "brx": "Bodo", "doi": "Dogri",
-            "en": "English", "gom": "Konkani", "gu": "Gujarati", "hi": "Hindi",
-            "kn": "Kannada", "ks": "Kashmiri", "mai": "Maithili", "ml": "Malayalam",
-            "mni": "Manipuri", "mr": "Marathi", "ne": "Nepali", "or": "Odia",
-            "pa": "Punjabi", "sa": "Sanskrit", "sat": "Santali", "sd": "Sindhi",
-            "ta": "Tamil", "te": "Telugu"
-        }
-    }
+        "total": 4
+    },
+    "xtts-hindi": {
+        "model": "xtts-hindi",
+        "voices": {},
+        "note": "XTTS-Hindi uses voice cloning. Upload your own voice file.",
+        "total": 0
+    },
+    "f5-hindi": {
+        "model": "f5-hindi",
+        "voices": {},
+        "note": "F5-Hindi uses voice cloning. Upload your own voice file via /synthesize-with-voice endpoint.",
+        "total": 0
+    },
+    "vibevoice-hindi": {
+        "model": "vibevoice-hindi",
+        "voices": {
+            "hi-Priya_woman": "Hindi Female (Priya) - Calm, clear voice",
+            "hi-Raj_man": "Hindi Male (Raj) - Professional tone",
+            "hi-Ananya_woman": "Hindi Female (Ananya) - Expressive voice",
+            "hi-Vikram_man": "Hindi Male (Vikram) - Deep, authoritative",
+        },
+        "note": "VibeVoice supports both built-in speakers and voice cloning via /synthesize-with-voice endpoint.",
+        "total": 4
+    },
+}
 
 
 @app.get("/speakers")
 async def get_speakers(model: str = "kokoro"):
     """Get available speakers/voices for a model"""
-    if model == "kokoro":
-        return {
-            "model": "kokoro",
-            "voices": {
-                "hf_alpha": "Hindi Female Alpha",
-                "hf_beta": "Hindi Female Beta",
-                "hm_omega": "Hindi Male Omega",
-                "hm_psi": "Hindi Male Psi"
-            },
-            "total": 4
-        }
-    elif model == "indic-parler":
-        return {
-            "model": "indic-parler",
-            "voices": {
-                "female_calm": "A female speaker with a calm and clear voice.",
-                "male_calm": "A male speaker with a calm and clear voice.",
-                "female_expressive": "A female speaker with an expressive and energetic voice.",
-                "male_expressive": "A male speaker with an expressive and energetic voice.",
-            },
-            "total": 4
-        }
-    elif model == "xtts-hindi":
-        return {
-            "model": "xtts-hindi",
-            "voices": {},
-            "note": "XTTS-Hindi uses voice cloning. Upload your own voice file.",
-            "total": 0
-        }
-    elif model == "f5-hindi":
-        return {
-            "model": "f5-hindi",
-            "voices": {},
-            "note": "F5-Hindi uses voice cloning. Upload your own voice file via /synthesize-with-voice endpoint.",
-            "total": 0
-        }
-    elif model == "vibevoice-hindi":
-        return {
-            "model": "vibevoice-hindi",
-            "voices": {
-                "hi-Priya_woman": "Hindi Female (Priya) - Calm, clear voice",
-                "hi-Raj_man": "Hindi Male (Raj) - Professional tone",
-                "hi-Ananya_woman": "Hindi Female (Ananya) - Expressive voice",
-                "hi-Vikram_man": "Hindi Male (Vikram) - Deep, authoritative",
-            },
-            "note": "VibeVoice supports both built-in speakers and voice cloning via /synthesize-with-voice endpoint.",
-            "total": 4
-        }
-    else:
+    speakers = _SPEAKERS.get(model)
+    if speakers is None:
         raise HTTPException(status_code=400, detail=f"Unknown model: {model}")
+    return speakers
 
 
-def get_or_initialize_engine(model_name: str):
-    if model_name not in ["xtts-hindi", "indic-parler", "kokoro", "f5-hindi", "vibevoice-hindi"]:
+def check_model(model_name: str):
+    if model_name not in _VALID_MODELS:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid model: {model_name}. Choose 'xtts-hindi', 'indic-parler', 'kokoro', 'f5-hindi', or 'vibevoice-hindi'"
         )
+
+
+def load_engine(model_name: str) -> TTSBase:
+    """Create and initialize an engine (blocking; runs in the worker pool)"""
+    try:
+        print(f"Initializing {model_name} model...")
+        # Use CUDA for vibevoice-hindi by default (optimized for T4 GPU)
+        device = "cuda" if model_name == "vibevoice-hindi" else "cpu"
+        tts = get_tts_engine(model_name, device=device, dtype=model_dtype(model_name))
+        tts.initialize()
+        print(f"{model_name} model initialized successfully")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to initialize {model_name}: {str(e)}")
+    return tts
+
+
+async def get_engine(model_name: str) -> TTSBase:
+    """Return a ready engine, loading it in the worker pool on first use"""
+    check_model(model_name)
+    # `engines` is only read and written on the event loop, so the LRU order
+    # and /health's iteration never race with a worker thread
+    if model_name in engines:
+        engines.move_to_end(model_name)
+        return engines[model_name]
+    # Concurrent first requests for a model wait on the same lock, so the
+    # weights are loaded once; later waiters find it in `engines`
+    async with _init_locks[model_name]:
+        if model_name in engines:
+            engines.move_to_end(model_name)
+            return engines[model_name]
+        loop = asyncio.get_running_loop()
+        tts = await loop.run_in_executor(executor, load_engine, model_name)
+        engines[model_name] = tts
+    # Evicting outside this model's lock: an eviction waits on the victim's
+    # lock, so holding our own here could deadlock with the victim's loader
+    await evict_engines()
+    return tts
+
+
+def _unload_engine(tts: TTSBase):
+    """Unload an engine and hand its memory back (blocking)"""
+    tts.unload()
+    gc.collect()
+    # Only touch torch if an engine already imported it
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+async def evict_engines():
+    """Unload least-recently-used engines beyond MAX_RESIDENT_MODELS"""
+    if not MAX_RESIDENT_MODELS:
+        return
     
-    if model_name not in engines:
-        try:
-            print(f"Initializing {model_name} model...")
-            # Use CUDA for vibevoice-hindi by default (optimized for T4 GPU)
-            device = "cuda" if model_name == "vibevoice-hindi" else "cpu"
-            engines[model_name] = get_tts_engine(model_name, device=device)
-            engines[model_name].initialize()
-            print(f"{model_name} model initialized successfully")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to initialize {model_name}: {str(e)}")
-    
-    return engines[model_name]
+    loop = asyncio.get_running_loop()
+    while len(engines) > MAX_RESIDENT_MODELS:
+        name, tts = engines.popitem(last=False)
+        print(f"Evicting {name} model (MAX_RESIDENT_MODELS={MAX_RESIDENT_MODELS})")
+        # Holding the init lock makes a reload of this model wait until the
+        # old copy is gone; taking every permit of its semaphore waits for
+        # in-flight syntheses (batches, streams, voice cloning) to finish
+        async with _init_locks[name]:
+            sem = model_semaphore(name)
+            permits = model_concurrency(name)
+            for _ in range(permits):
+                await sem.acquire()
+            try:
+                await loop.run_in_executor(executor, _unload_engine, tts)
+            finally:
+                for _ in range(permits):
+                    sem.release()
+
+
+def model_params(request: TTSRequest) -> dict:
+    """Collect the model-specific synthesis parameters from a request"""
+    params = {}
+    if request.model == "xtts-hindi":
+        params["language"] = request.language
+    elif request.model == "indic-parler":
+        if request.description:
+            params["description"] = request.description
+    elif request.model == "kokoro":
+        if request.voice:
+            params["voice"] = request.voice
+        if request.speed:
+            params["speed"] = request.speed
+    elif request.model == "vibevoice-hindi":
+        if request.speaker:
+            params["speaker"] = request.speaker
+        if request.cfg_scale:
+            params["cfg_scale"] = request.cfg_scale
+        if request.seed is not None:
+            params["seed"] = request.seed
+    return params
 
 
 @app.post("/synthesize", response_model=TTSResponse)
 async def synthesize_speech(request: TTSRequest):
     try:
-        tts = get_or_initialize_engine(request.model)
+        tts = await get_engine(request.model)
         
         if request.output_filename:
             output_path = request.output_filename
         else:
-            safe_text = "".join(c for c in request.text[:30] if c.isalnum() or c in (' ', '-', '_'))
-            safe_text = safe_text.replace(' ', '_')
-            output_path = f"{safe_text}.wav"
+            output_path = f"{_safe_filename(request.text)}.wav"
         
         synth_params = {
             "text": request.text,
             "output_path": output_path,
-            "use_default_output_dir": request.use_default_output_dir
+            "use_default_output_dir": request.use_default_output_dir,
+            **model_params(request)
         }
         
-        if request.model == "xtts-hindi":
-            synth_params["language"] = request.language
-        elif request.model == "indic-parler":
-            if request.description:
-                synth_params["description"] = request.description
-        elif request.model == "kokoro":
-            if request.voice:
-                synth_params["voice"] = request.voice
-            if request.speed:
-                synth_params["speed"] = request.speed
-        elif request.model == "vibevoice-hindi":
-            if request.speaker:
-                synth_params["speaker"] = request.speaker
-            if request.cfg_scale:
-                synth_params["cfg_scale"] = request.cfg_scale
-            if request.seed is not None:
-                synth_params["seed"] = request.seed
-        
-        result_path = tts.synthesize(**synth_params)
-        file_size = Path(result_path).stat().st_size if Path(result_path).exists() else None
+        batch_key = (request.model,) + tuple(sorted(
+            (k, v) for k, v in synth_params.items() if k not in ("text", "output_path")
+        ))
+        result_path = await batcher.submit(batch_key, (tts, synth_params), len(request.text))
+        file_size = _size_or_none(result_path)
         
-        return TTSResponse(
-            success=True,
-            message="Speech synthesized successfully",
-            output_path=result_path,
-            model_used=request.model,
-            file_size=file_size
-        )
+        # Plain dicts are validated once against response_model, instead of
+        # building a TTSResponse only for FastAPI to dump and re-validate it
+        return {
+            "success": True,
+            "message": "Speech synthesized successfully",
+            "output_path": result_path,
+            "model_used": request.model,
+            "file_size": file_size
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/synthesize-with-voice")
+@app.post("/synthesize-stream")
+async def synthesize_stream(request: TTSRequest):
+    """Stream synthesized audio as WAV chunks while it is being generated"""
+    tts = await get_engine(request.model)
+    
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    # Set once the response stops reading, so the producer quits generating
+    # audio nobody will receive
+    cancelled = threading.Event()
+    
+    def produce():
+        # Runs in the worker pool and hands chunks back to the event loop
+        try:
+            for chunk in tts.stream_synthesize(text=request.text, **model_params(request)):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+        loop.call_soon_threadsafe(chunks.put_nowait, None)
+    
+    # The model's slot is held until the producer thread finishes, which is
+    # at most one chunk after the client disconnects
+    sem = model_semaphore(request.model)
+    await sem.acquire()
+    loop.run_in_executor(executor, produce).add_done_callback(lambda _: sem.release())
+    
+    # Wait for the first chunk so failures before any audio still return an error status
+    try:
+        first = await chunks.get()
+    except BaseException:
+        cancelled.set()
+        raise
+    if isinstance(first, Exception):
+        raise HTTPException(status_code=500, detail=str(first))
+    
+    async def body():
+        try:
+            chunk = first
+            while chunk is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+                chunk = await chunks.get()
+        finally:
+            cancelled.set()
+    
+    return StreamingResponse(body(), media_type="audio/wav")
+
+
+@app.post("/synthesize-with-voice", response_model=TTSResponse)
 async def synthesize_with_voice(
     text: str = Form(...),
     model: str = Form("xtts-hindi"),
@@ -383,26 +777,22 @@ async def synthesize_with_voice(
     seed: Optional[int] = Form(None),
     split_sentences: bool = Form(True)
 ):
-    if model not in ["xtts-hindi", "f5-hindi", "vibevoice-hindi"]:
+    if model not in _VOICE_CLONING_MODELS:
         raise HTTPException(
             status_code=400,
             detail="Voice cloning only supported with 'xtts-hindi', 'f5-hindi', or 'vibevoice-hindi' models."
         )
     
+    voice_path: Optional[Path] = None
     try:
-        tts = get_or_initialize_engine(model)
+        tts = await get_engine(model)
         
-        voice_path = UPLOAD_DIR / voice_file.filename
-        with open(voice_path, "wb") as f:
-            content = await voice_file.read()
-            f.write(content)
+        voice_path = await save_upload(voice_file)
         
         if output_filename:
             output_path = output_filename
         else:
-            safe_text = "".join(c for c in text[:30] if c.isalnum() or c in (' ', '-', '_'))
-            safe_text = safe_text.replace(' ', '_')
-            output_path = f"{safe_text}_cloned.wav"
+            output_path = f"{_safe_filename(text)}_cloned.wav"
         
         synth_params = {
             "text": text,
@@ -421,52 +811,79 @@ async def synthesize_with_voice(
             if seed is not None:
                 synth_params["seed"] = seed
         
-        result_path = tts.synthesize(**synth_params)
+        loop = asyncio.get_running_loop()
+        async with model_semaphore(model):
+            result_path = await loop.run_in_executor(
+                executor, functools.partial(tts.synthesize, **synth_params)
+            )
         
-        voice_path.unlink()
-        file_size = Path(result_path).stat().st_size if Path(result_path).exists() else None
+        file_size = _size_or_none(result_path)
         
-        return TTSResponse(
-            success=True,
-            message="Speech synthesized with voice cloning",
-            output_path=result_path,
-            model_used=model,
-            file_size=file_size
-        )
+        return {
+            "success": True,
+            "message": "Speech synthesized with voice cloning",
+            "output_path": result_path,
+            "model_used": model,
+            "file_size": file_size
+        }
         
     except Exception as e:
-        if voice_path.exists():
-            voice_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if voice_path is not None:
+            voice_path.unlink(missing_ok=True)
 
 
 @app.get("/download/{model}/{filename}")
-async def download_file(model: str, filename: str):
+async def download_file(model: str, filename: str, request: Request):
     file_path = Path("output") / model / filename
     
-    if not file_path.exists():
+    # A single stat serves the 404 check, the ETag and FileResponse itself
+    try:
+        st = os.stat(file_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(path=file_path, media_type="audio/wav", filename=filename)
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"Cache-Control": DOWNLOAD_CACHE_CONTROL, "ETag": etag}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in
+                          (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(path=file_path, media_type="audio/wav", filename=filename,
+                        method="GET", stat_result=st, headers=headers)
+
+
+def _delete_outputs(dirs: List[str]) -> int:
+    """Delete the .wav files in each output/<dir> folder and return how many were removed"""
+    deleted = 0
+    for d in dirs:
+        try:
+            entries = os.scandir(os.path.join("output", d))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(".wav") and entry.is_file():
+                    os.unlink(entry.path)
+                    deleted += 1
+    return deleted
 
 
 @app.delete("/cleanup/{model}")
 async def cleanup_outputs(model: str):
+    if model == "all":
+        models = list(_CLEANUP_DIR_MAP.values())
+    elif model in _CLEANUP_DIR_MAP:
+        models = [_CLEANUP_DIR_MAP[model]]
+    else:
+        raise HTTPException(status_code=400, detail="Invalid model")
+    
     try:
-        if model == "all":
-            models = ["xtts_hindi", "indic_parler", "kokoro", "f5_hindi", "vibevoice_hindi"]
-        elif model in ["xtts-hindi", "indic-parler", "kokoro", "f5-hindi", "vibevoice-hindi"]:
-            models = [model.replace("-", "_")]
-        else:
-            raise HTTPException(status_code=400, detail="Invalid model")
-        
-        deleted_count = 0
-        for m in models:
-            output_dir = Path("output") / m
-            if output_dir.exists():
-                for file in output_dir.glob("*.wav"):
-                    file.unlink()
-                    deleted_count += 1
+        loop = asyncio.get_running_loop()
+        deleted_count = await loop.run_in_executor(None, _delete_outputs, models)
         
         return {"success": True, "message": f"Deleted {deleted_count} files", "models_cleaned": models}
         
@@ -479,4 +896,16 @@ if __name__ == "__main__":
     print("API will be available at: http://localhost:8000")
     print("API docs at: http://localhost:8000/docs")
     
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # Auto-reload is for development only; it forces a single worker process
+    reload = os.getenv("APP_ENV") == "dev"
+    # Each worker process loads its own copy of every model it serves, and
+    # MAX_RESIDENT_MODELS and the per-model semaphores are per process, so
+    # one worker unless WEB_CONCURRENCY asks for more
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    
+    # uvloop/httptools when installed (uvloop is unavailable on Windows)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=reload,
+                workers=1 if reload else workers, loop=loop, http=http)
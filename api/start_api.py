@@ -3,6 +3,7 @@ Startup script for TTS Playground API
 """
 import sys
 import os
+import importlib.util
 import uvicorn
 from pathlib import Path
 
@@ -27,10 +28,24 @@ if __name__ == "__main__":
     print("\nPress Ctrl+C to stop")
     print("=" * 60)
     
+    # Auto-reload is for development only; it forces a single worker process
+    reload = os.getenv("APP_ENV") == "dev"
+    # Each worker process loads its own copy of every model it serves, and
+    # MAX_RESIDENT_MODELS and the per-model semaphores are per process, so
+    # one worker unless WEB_CONCURRENCY asks for more
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    
+    # uvloop/httptools when installed (uvloop is unavailable on Windows)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=1 if reload else workers,
+        loop=loop,
+        http=http,
         log_level="info"
     )
@@ -1,90 +1,187 @@
 """
 Test script for TTS Playground API
+
+Requires aiohttp: pip install aiohttp
 """
-import requests
+import asyncio
 import json
+import logging
+import os
+
+import aiohttp
+
+# Set TTS_API_URL to test a remote deployment, e.g. an ngrok URL on Colab
+BASE_URL = os.getenv("TTS_API_URL", "http://localhost:8000")
+
+logger = logging.getLogger("test_api")
+logging.basicConfig(level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s")
+
+
+class PrettyJSON:
+    """Defers pretty-printing until a log record is actually emitted"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data, indent=2, ensure_ascii=False)
 
-BASE_URL = "http://localhost:8000"
+# Bounds the wait for the read-only probes
+TIMEOUT = aiohttp.ClientTimeout(total=60)
+# Synthesis calls can include a first-time model load, which alone can take
+# minutes, so they get a much longer budget
+SYNTHESIS_TIMEOUT = aiohttp.ClientTimeout(total=float(os.getenv("TTS_SYNTHESIS_TIMEOUT", "900")))
+CHUNK_SIZE = 64 * 1024
+
+# Synthesis calls are retried only when the server cannot have started on
+# them: failed connections and gateway errors (common behind ngrok on Colab).
+# Timeouts are not retried, since the server keeps working on the abandoned
+# request and a retry would queue a duplicate behind it. Retries wait
+# RETRY_BACKOFF * 2**attempt seconds between tries
+RETRIES = 4
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+async def post_with_retry(session, path, payload):
+    """POST a synthesis payload, retrying connection and gateway errors with exponential backoff"""
+    for attempt in range(RETRIES + 1):
+        try:
+            response = await session.post(path, json=payload, timeout=SYNTHESIS_TIMEOUT)
+        except aiohttp.ClientConnectorError as e:
+            if attempt == RETRIES:
+                raise
+            logger.warning("Retrying %s after error: %r", path, e)
+        else:
+            if response.status not in RETRY_STATUSES or attempt == RETRIES:
+                return response
+            response.release()
+            logger.warning("Retrying %s after status %s", path, response.status)
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+async def run_test(test, session):
+    """Run one probe, reporting a failure instead of aborting the whole suite"""
+    try:
+        await test(session)
+    except aiohttp.ClientConnectorError:
+        raise
+    except Exception as e:
+        logger.error("\n❌ %s failed: %r", test.__name__, e)
 
 
-def test_health():
+async def test_health(session):
     """Test health endpoint"""
-    print("\n1. Testing health endpoint...")
-    response = requests.get(f"{BASE_URL}/health")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    async with session.get("/health") as response:
+        data = await response.json()
+    # Logged in one go so concurrent probes don't interleave their output
+    logger.info("\n1. Testing health endpoint...")
+    logger.info("Status: %s", response.status)
+    logger.info("Response: %s", PrettyJSON(data))
 
 
-def test_models():
+async def test_models(session):
     """Test models endpoint"""
-    print("\n2. Testing models endpoint...")
-    response = requests.get(f"{BASE_URL}/models")
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    async with session.get("/models") as response:
+        data = await response.json()
+    logger.info("\n2. Testing models endpoint...")
+    logger.info("Status: %s", response.status)
+    logger.info("Response: %s", PrettyJSON(data))
 
 
-def test_speakers():
+async def test_speakers(session):
     """Test speakers endpoint"""
-    print("\n3. Testing speakers endpoint...")
-    response = requests.get(f"{BASE_URL}/speakers?model=indri")
-    print(f"Status: {response.status_code}")
-    data = response.json()
-    print(f"Total speakers: {data['total']}")
-    print(f"First 3 speakers: {json.dumps(dict(list(data['speakers'].items())[:3]), indent=2)}")
+    async with session.get("/speakers", params={"model": "kokoro"}) as response:
+        data = await response.json()
+    logger.info("\n3. Testing speakers endpoint...")
+    logger.info("Status: %s", response.status)
+    logger.info("Total speakers: %s", data['total'])
+    logger.info("First 3 speakers: %s", PrettyJSON(dict(list(data['voices'].items())[:3])))
 
 
-def test_synthesize_indri():
-    """Test synthesis with Indri"""
-    print("\n4. Testing Indri synthesis...")
+async def log_synthesis_response(response, output_filename):
+    """Log a synthesis response, streaming audio bodies to disk in chunks"""
+    logger.info("Status: %s", response.status)
+    if response.content_type.startswith("audio/"):
+        # Audio is written as it arrives so memory stays flat for long clips
+        with open(output_filename, "wb") as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                f.write(chunk)
+        logger.info("Audio saved to: %s", output_filename)
+    else:
+        logger.info("Response: %s", PrettyJSON(await response.json()))
+
+
+async def test_synthesize_kokoro(session):
+    """Test synthesis with Kokoro"""
+    logger.info("\n4. Testing Kokoro synthesis...")
     payload = {
         "text": "नमस्ते, यह एक टेस्ट है।",
-        "model": "indri",
-        "output_filename": "test_indri_api.wav",
-        "speaker": "[spkr_68]",
-        "max_new_tokens": 4096
+        "model": "kokoro",
+        "output_filename": "test_kokoro_api.wav",
+        "voice": "hf_alpha"
     }
-    
-    response = requests.post(f"{BASE_URL}/synthesize", json=payload)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
 
+    async with await post_with_retry(session, "/synthesize", payload) as response:
+        await log_synthesis_response(response, payload["output_filename"])
 
-def test_synthesize_xtts():
+
+async def test_synthesize_xtts(session):
     """Test synthesis with XTTS"""
-    print("\n5. Testing XTTS synthesis...")
+    logger.info("\n5. Testing XTTS synthesis...")
     payload = {
         "text": "यह XTTS का टेस्ट है।",
         "model": "xtts-hindi",
         "output_filename": "test_xtts_api.wav",
         "language": "hi"
     }
-    
-    response = requests.post(f"{BASE_URL}/synthesize", json=payload)
-    print(f"Status: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+
+    async with await post_with_retry(session, "/synthesize", payload) as response:
+        await log_synthesis_response(response, payload["output_filename"])
+
+
+async def test_synthesize_stream(session):
+    """Test streaming synthesis with Kokoro"""
+    logger.info("\n6. Testing streaming synthesis...")
+    payload = {
+        "text": "यह स्ट्रीमिंग का टेस्ट है।",
+        "model": "kokoro"
+    }
+
+    async with await post_with_retry(session, "/synthesize-stream", payload) as response:
+        await log_synthesis_response(response, "test_stream_api.wav")
+
+
+async def main():
+    # Every probe targets the same origin, so one keep-alive pool bound to
+    # base_url serves them all
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+    async with aiohttp.ClientSession(BASE_URL, connector=connector, timeout=TIMEOUT) as session:
+        # Read-only probes run concurrently; synthesis writes output files on
+        # the server, so those calls stay sequential
+        await asyncio.gather(*(run_test(t, session) for t in (test_health, test_models, test_speakers)))
+        await run_test(test_synthesize_kokoro, session)
+        # await run_test(test_synthesize_xtts, session)  # Uncomment if you want to test XTTS
+        # await run_test(test_synthesize_stream, session)  # Uncomment to test /synthesize-stream
 
 
 if __name__ == "__main__":
     print("=" * 60)
     print("TTS Playground API Test Suite")
     print("=" * 60)
-    print("\nMake sure the API is running at http://localhost:8000")
+    print(f"\nMake sure the API is running at {BASE_URL}")
     print("Start it with: python api/start_api.py")
-    
+
     input("\nPress Enter to start tests...")
-    
+
     try:
-        test_health()
-        test_models()
-        test_speakers()
-        test_synthesize_indri()
-        # test_synthesize_xtts()  # Uncomment if you want to test XTTS
-        
+        asyncio.run(main())
+
         print("\n" + "=" * 60)
         print("Tests completed!")
         print("=" * 60)
-        
-    except requests.exceptions.ConnectionError:
+
+    except aiohttp.ClientConnectorError:
         print("\n❌ Error: Could not connect to API")
         print("Make sure the API is running: python api/start_api.py")
     except Exception as e:
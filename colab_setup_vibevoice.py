@@ -18,46 +18,53 @@ Or run cells individually:
 import subprocess
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
 def run_cmd(cmd, check=True):
-    """Run shell command"""
-    print(f"Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, check=check)
+    """Run a command; strings go through the shell, argv lists run directly"""
+    shell = isinstance(cmd, str)
+    print(f"Running: {cmd if shell else ' '.join(cmd)}")
+    result = subprocess.run(cmd, shell=shell, check=check)
     return result.returncode == 0
 
 
+def make_dirs():
+    """Create output directories"""
+    os.makedirs("output/vibevoice_hindi", exist_ok=True)
+    os.makedirs("demo/voices", exist_ok=True)
+
+
 def setup_environment():
     """Setup the VibeVoice environment in Colab"""
     print("="*60)
     print("Setting up VibeVoice Hindi TTS for Colab T4 GPU")
     print("="*60)
     
-    # Check GPU
-    print("\n1. Checking GPU...")
-    run_cmd("nvidia-smi", check=False)
-    
-    # Install system dependencies
-    print("\n2. Installing system dependencies...")
-    run_cmd("apt-get update && apt-get install -y ffmpeg", check=False)
-    
-    # Install VibeVoice from community fork FIRST
-    print("\n3. Installing VibeVoice...")
-    run_cmd("pip install git+https://github.com/vibevoice-community/VibeVoice.git")
+    # The GPU check and directory setup are independent of the apt install,
+    # so they run while apt is still downloading
+    print("\n1. Checking GPU, installing system dependencies, creating directories...")
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        apt = ex.submit(run_cmd, "apt-get update && apt-get install -y ffmpeg", check=False)
+        gpu = ex.submit(run_cmd, "nvidia-smi", check=False)
+        dirs = ex.submit(make_dirs)
+        gpu.result()
+        dirs.result()
+        apt.result()
     
-    # Install other dependencies
-    print("\n4. Installing other dependencies...")
-    run_cmd("pip install soundfile numpy huggingface_hub accelerate scipy librosa")
-    run_cmd("pip install fastapi uvicorn python-multipart")
+    # Install VibeVoice (community fork) and the other dependencies in a
+    # single pip run so they share one resolver pass and download session
+    print("\n2. Installing VibeVoice and dependencies...")
+    # --prefer-binary keeps scipy/librosa etc. on prebuilt wheels; only the
+    # VibeVoice git dependency is built from source
+    run_cmd([sys.executable, "-m", "pip", "install", "--no-input", "--prefer-binary",
+             "git+https://github.com/vibevoice-community/VibeVoice.git",
+             "soundfile", "numpy", "huggingface_hub", "accelerate", "scipy", "librosa",
+             "fastapi", "uvicorn", "python-multipart"])
     
     # Install tts-playground WITHOUT deps (avoids TTS library conflict)
-    print("\n5. Installing tts-playground (no-deps)...")
-    run_cmd("pip install -e . --no-deps")
-    
-    # Create output directories
-    print("\n6. Creating directories...")
-    os.makedirs("output/vibevoice_hindi", exist_ok=True)
-    os.makedirs("demo/voices", exist_ok=True)
+    print("\n3. Installing tts-playground (no-deps)...")
+    run_cmd([sys.executable, "-m", "pip", "install", "--no-input", "--no-deps", "-e", "."])
     
     print("\n" + "="*60)
     print("Setup complete!")
@@ -71,9 +78,12 @@ def test_vibevoice():
     print("="*60)
     
     try:
+        from huggingface_hub import snapshot_download
         from tts_playground import get_tts_engine
         
-        print("\n1. Initializing model...")
+        # Fetch model files in parallel so initialize() loads from a warm cache
+        print("\n1. Downloading and initializing model...")
+        snapshot_download("tarun7r/vibevoice-hindi-1.5B", max_workers=8)
         tts = get_tts_engine("vibevoice-hindi", device="cuda")
         tts.initialize()
         
@@ -124,6 +134,14 @@ def start_api():
     run_cmd("python start_api.py")
 
 
+def use_persistent_pip_cache():
+    """Point pip's cache at Google Drive when mounted, so wheels survive session restarts"""
+    drive = "/content/drive/MyDrive"
+    if "PIP_CACHE_DIR" not in os.environ and os.path.isdir(drive):
+        os.environ["PIP_CACHE_DIR"] = os.path.join(drive, "pip-cache")
+        print(f"Using pip cache: {os.environ['PIP_CACHE_DIR']}")
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Colab setup for VibeVoice Hindi")
@@ -132,6 +150,9 @@ def main():
     parser.add_argument("--api", action="store_true", help="Start API server")
     args = parser.parse_args()
     
+    # Inherited by every pip subprocess started below
+    use_persistent_pip_cache()
+    
     if args.setup_only:
         setup_environment()
     elif args.test_only:
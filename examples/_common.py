@@ -0,0 +1,132 @@
+"""
+Shared helpers for the example scripts
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=None)
+def default_device() -> str:
+    """'cuda' when a GPU is available, otherwise 'cpu'"""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine(name: str, device: str = "cpu", **kwargs):
+    """
+    Return an initialized engine, loading each (name, device, kwargs) once per run
+
+    Examples that call this repeatedly share the same loaded model instead of
+    reloading the weights in every function.
+    """
+    from tts_playground import get_tts_engine
+
+    tts = get_tts_engine(name, device=device, **kwargs)
+    tts.initialize()
+    return tts
+
+
+def prefetch(repo_id: str, **kwargs) -> str:
+    """
+    Download a model repo into the Hugging Face cache, fetching files in parallel
+
+    Engines then load from the warm cache instead of downloading file by file.
+    """
+    from huggingface_hub import snapshot_download
+
+    return snapshot_download(repo_id, max_workers=8, token=os.getenv("HF_TOKEN"), **kwargs)
+
+
+# Synthesized audio keyed by engine, text and parameters; set TTS_NO_CACHE=1 to bypass
+CACHE_DIR = Path(".tts_cache")
+
+# Folder each engine writes to under output/ when use_default_output_dir is set
+_OUTPUT_SUBDIRS = {
+    "XTTSHindi": "xtts_hindi",
+    "IndicParlerTTS": "indic_parler",
+    "KokoroTTS": "kokoro",
+    "F5HindiTTS": "f5_hindi",
+    "VibeVoiceHindiTTS": "vibevoice_hindi",
+}
+
+
+def _cache_key(tts, params: dict) -> str:
+    """Hash the engine identity and synthesis parameters (minus output_path)"""
+    key = {"engine": type(tts).__name__, "model": tts.model_name}
+    for name, value in params.items():
+        if name == "output_path":
+            continue
+        if name in ("speaker_wav", "voice_wav") and value is not None:
+            # Reference audio is keyed by its content version, not just its name
+            st = os.stat(value)
+            value = [str(value), st.st_size, st.st_mtime_ns]
+        key[name] = value
+    blob = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def cached_synthesize(tts, **params):
+    """
+    Call tts.synthesize(**params), reusing audio from an earlier identical call
+
+    Returns what synthesize would: audio bytes when output_path is None,
+    otherwise the path the audio was written to.
+    """
+    if os.getenv("TTS_NO_CACHE") == "1":
+        return tts.synthesize(**params)
+
+    cached = CACHE_DIR / f"{_cache_key(tts, params)}.wav"
+    output_path = params.get("output_path")
+
+    if cached.exists():
+        if output_path is None:
+            return cached.read_bytes()
+        dest = Path(output_path)
+        if params.get("use_default_output_dir", True) and not dest.is_absolute():
+            dest = Path("output") / _OUTPUT_SUBDIRS[type(tts).__name__] / dest
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, dest)
+        print(f"(cached) {dest}")
+        return str(dest)
+
+    result = tts.synthesize(**params)
+    CACHE_DIR.mkdir(exist_ok=True)
+    if isinstance(result, bytes):
+        cached.write_bytes(result)
+    else:
+        shutil.copyfile(result, cached)
+    return result
+
+
+def synthesize_batch_unique(tts, texts, output_dir, **kwargs):
+    """
+    Like tts.synthesize_batch, but each distinct text is synthesized only once
+
+    Repeated texts get a copy of the first rendering. Output files keep the
+    batch naming (output_0001.wav, ...) in the order of the original list.
+    """
+    output_dir = Path(output_dir)
+    unique = list(dict.fromkeys(texts))
+    if len(unique) == len(texts):
+        return tts.synthesize_batch(texts=texts, output_dir=output_dir, **kwargs)
+
+    # Render into a scratch folder so unique-index names can't clash with the final ones
+    scratch = output_dir / ".unique"
+    rendered = dict(zip(unique, tts.synthesize_batch(texts=unique, output_dir=scratch, **kwargs)))
+    output_paths = []
+    for i, text in enumerate(texts):
+        dest = output_dir / f"output_{i+1:04d}.wav"
+        shutil.copyfile(rendered[text], dest)
+        output_paths.append(str(dest))
+    shutil.rmtree(scratch)
+    print(f"Synthesized {len(unique)} unique texts for {len(texts)} outputs")
+    return output_paths
@@ -9,7 +9,7 @@ Usage:
 """
 
 from pathlib import Path
-from tts_playground import get_tts_engine
+from _common import default_device, get_engine, synthesize_batch_unique
 
 
 def main():
@@ -28,9 +28,10 @@ def main():
     
     print(f"Using reference audio: {ref_audio}")
     
-    # Initialize F5-Hindi TTS engine
+    # Initialize F5-Hindi TTS engine (get_engine imports the package lazily,
+    # so the early exit above stays instant)
     print("\nInitializing F5-Hindi TTS...")
-    tts = get_tts_engine("f5-hindi", device="cpu")
+    tts = get_engine("f5-hindi", device=default_device())
     
     # Hindi text samples
     hindi_texts = [
@@ -42,16 +43,17 @@ def main():
     # Optional: transcript of reference audio (improves quality)
     ref_text = ""  # Add transcript if available
     
-    # Generate speech for each text
-    for i, text in enumerate(hindi_texts):
-        print(f"\nGenerating audio for: {text}")
-        output_path = tts.synthesize(
-            text=text,
-            output_path=f"f5_hindi_output_{i+1}.wav",
-            speaker_wav=ref_audio,
-            ref_text=ref_text
-        )
-        print(f"Saved to: {output_path}")
+    # Generate speech for all texts in one batch call, sharing the reference audio
+    print(f"\nGenerating audio for {len(hindi_texts)} texts...")
+    output_paths = synthesize_batch_unique(
+        tts,
+        texts=hindi_texts,
+        output_dir=Path("output") / "f5_hindi",
+        speaker_wav=ref_audio,
+        ref_text=ref_text
+    )
+    for text, output_path in zip(hindi_texts, output_paths):
+        print(f"{text} -> {output_path}")
     
     print("\nDone! Check the output/f5_hindi/ folder for generated audio files.")
 
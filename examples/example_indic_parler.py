@@ -3,15 +3,20 @@ Example: Indic Parler TTS
 Demonstrates text-to-speech for Indian languages using ai4bharat/indic-parler-tts
 """
 
-from tts_playground import get_tts_engine
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tts_playground.audio import write_pcm16
+
+from _common import default_device, get_engine, prefetch
 
 
 def main():
-    # Create TTS engine
-    tts = get_tts_engine("indic-parler", device="cpu")
+    # Fetch the model files in parallel so initialize() loads from the cache
+    prefetch("ai4bharat/indic-parler-tts")
     
-    # Initialize model (downloads on first run)
-    tts.initialize()
+    # Create and initialize TTS engine (downloads on first run)
+    tts = get_engine("indic-parler", device=default_device())
     
     # Print supported languages
     print("Supported languages:")
@@ -34,15 +39,21 @@ def main():
     ]
     
     # Generate audio for each example
-    for lang, text, filename, desc in examples:
-        print(f"\nGenerating {lang}: {text[:30]}...")
+    # Files are written on a background thread while the model generates the
+    # next clip, so disk I/O no longer sits between forward passes
+    output_dir = Path("output") / "indic_parler"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=2) as writer:
+        pending = []
+        for lang, text, filename, desc in examples:
+            print(f"\nGenerating {lang}: {text[:30]}...")
+            audio, sample_rate = tts.synthesize_raw(text=text, description=desc)
+            output = output_dir / filename
+            pending.append((output, writer.submit(write_pcm16, str(output), audio, sample_rate)))
         
-        output = tts.synthesize(
-            text=text,
-            output_path=filename,
-            description=desc,
-        )
-        print(f"Saved to: {output}")
+        for output, future in pending:
+            future.result()
+            print(f"Saved to: {output}")
 
 
 if __name__ == "__main__":
@@ -7,16 +7,20 @@ Usage:
     2. Run: python examples/example_kokoro_hindi.py
 """
 
-from tts_playground import get_tts_engine
+from pathlib import Path
+from _common import get_engine, prefetch, synthesize_batch_unique
 
 
 def main():
     # Initialize Kokoro TTS engine
     print("Initializing Kokoro TTS for Hindi...")
     
+    # Fetch the weights and Hindi voice packs in parallel (not every language's voices)
+    prefetch("hexgrad/Kokoro-82M", allow_patterns=["*.json", "*.pth", "voices/h*.pt"])
+    
     # Available Hindi voices:
     # hf_alpha, hf_beta (female), hm_omega, hm_psi (male)
-    tts = get_tts_engine("kokoro", device="cpu", voice="hm_psi")
+    tts = get_engine("kokoro", device="cpu", voice="hm_psi")
     
     # Print available voices
     print(f"Available Hindi voices: {list(tts.get_available_voices().keys())}")
@@ -28,15 +32,16 @@ def main():
         "उस प्रलयंकारी अग्नि से सागर के गर्भ में एक बालक का जन्म हुआ। उसका क्रंदन सुनकर धरती कांप उठी। ....वह बालक था—जालंधर।",
     ]
     
-    # Generate speech for each text
-    for i, text in enumerate(hindi_texts):
-        print(f"\nGenerating audio for: {text}")
-        output_path = tts.synthesize(
-            text=text,
-            output_path=f"hindi_output_{i+1}.wav",
-            speed=1.0
-        )
-        print(f"Saved to: {output_path}")
+    # Generate speech for all texts in one batch call
+    print(f"\nGenerating audio for {len(hindi_texts)} texts...")
+    output_paths = synthesize_batch_unique(
+        tts,
+        texts=hindi_texts,
+        output_dir=Path("output") / "kokoro",
+        speed=1.0
+    )
+    for text, output_path in zip(hindi_texts, output_paths):
+        print(f"{text} -> {output_path}")
     
     print("\nDone! Check the output/kokoro/ folder for generated audio files.")
 
@@ -12,7 +12,7 @@ Features:
 Optimized for T4 GPU (Colab)
 """
 
-from tts_playground import get_tts_engine
+from _common import cached_synthesize, get_engine, prefetch, synthesize_batch_unique
 
 
 def example_basic_synthesis():
@@ -21,15 +21,15 @@ def example_basic_synthesis():
     print("Example 1: Basic Hindi Synthesis")
     print("="*60)
     
-    # Initialize VibeVoice Hindi (uses CUDA by default)
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    # Initialize VibeVoice Hindi once; later examples reuse the loaded model
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     # Hindi text
     text = "नमस्ते, मैं विबवॉइस हिंदी हूं। मैं उच्च गुणवत्ता वाली हिंदी वाणी उत्पन्न कर सकता हूं।"
     
     # Synthesize with default speaker (hi-Priya_woman)
-    output_path = tts.synthesize(
+    output_path = cached_synthesize(
+        tts,
         text=text,
         output_path="vibevoice_basic.wav"
     )
@@ -44,8 +44,7 @@ def example_speaker_selection():
     print("Example 2: Different Speakers")
     print("="*60)
     
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     # Show available speakers
     speakers = tts.get_speakers()
@@ -58,7 +57,8 @@ def example_speaker_selection():
     # Generate with different speakers
     outputs = []
     for speaker in ["hi-Priya_woman", "hi-Raj_man"]:
-        output_path = tts.synthesize(
+        output_path = cached_synthesize(
+            tts,
             text=text,
             speaker=speaker,
             output_path=f"vibevoice_{speaker}.wav"
@@ -75,8 +75,7 @@ def example_voice_cloning():
     print("Example 3: Voice Cloning")
     print("="*60)
     
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     # Reference audio file (your voice sample)
     reference_audio = "my_voice.wav"  # Place your voice file here
@@ -101,8 +100,7 @@ def example_conversation():
     print("Example 4: Multi-Speaker Conversation")
     print("="*60)
     
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     # Define a conversation
     dialogue = [
@@ -128,8 +126,7 @@ def example_batch_synthesis():
     print("Example 5: Batch Synthesis")
     print("="*60)
     
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     texts = [
         "पहला वाक्य: भारत एक महान देश है।",
@@ -137,7 +134,8 @@ def example_batch_synthesis():
         "तीसरा वाक्य: विज्ञान और तकनीक में भारत आगे बढ़ रहा है।",
     ]
     
-    output_paths = tts.synthesize_batch(
+    output_paths = synthesize_batch_unique(
+        tts,
         texts=texts,
         output_dir="output/vibevoice_hindi/batch",
         speaker="hi-Priya_woman"
@@ -156,8 +154,7 @@ def example_custom_voice():
     print("Example 6: Custom Voice")
     print("="*60)
     
-    tts = get_tts_engine("vibevoice-hindi", device="cuda")
-    tts.initialize()
+    tts = get_engine("vibevoice-hindi", device="cuda")
     
     # Add a custom voice from your audio file
     custom_speaker_id = tts.add_custom_voice(
@@ -167,7 +164,8 @@ def example_custom_voice():
     
     text = "यह मेरी कस्टम आवाज़ है जो मैंने जोड़ी है।"
     
-    output_path = tts.synthesize(
+    output_path = cached_synthesize(
+        tts,
         text=text,
         speaker=custom_speaker_id,
         output_path="vibevoice_custom_voice.wav"
@@ -184,6 +182,9 @@ if __name__ == "__main__":
     
     # Run examples
     try:
+        # Fetch the model files in parallel before the first example loads them
+        prefetch("tarun7r/vibevoice-hindi-1.5B")
+        
         # Basic synthesis (always works)
         example_basic_synthesis()
         
@@ -4,7 +4,7 @@ Example usage of XTTS-Hindi TTS engine
 
 import os
 from pathlib import Path
-from tts_playground import get_tts_engine
+from _common import cached_synthesize, default_device, get_engine, prefetch, synthesize_batch_unique
 
 # Ensure HF_TOKEN is set
 if not os.getenv("HF_TOKEN"):
@@ -17,19 +17,17 @@ def example_basic_usage():
     print("Example 1: Basic TTS Synthesis")
     print("=" * 50)
     
-    # Create TTS engine
-    tts = get_tts_engine("xtts-hindi", device="cpu")
-    
-    # Initialize (this will download the model on first run)
+    # Create and initialize the TTS engine (downloads the model on first run)
     print("\nInitializing model...")
-    tts.initialize()
+    tts = get_engine("xtts-hindi", device=default_device())
     
     # Synthesize speech
     hindi_text = "नमस्ते, यह एक टेक्स्ट टू स्पीच उदाहरण है।"
     output_path = "output_basic.wav"
     
     print(f"\nSynthesizing: {hindi_text}")
-    result = tts.synthesize(
+    result = cached_synthesize(
+        tts,
         text=hindi_text,
         output_path=output_path,
         language="hi"
@@ -46,8 +44,9 @@ def example_context_manager():
     
     hindi_text = "आज का दिन बहुत सुंदर है।"
     
-    with get_tts_engine("xtts-hindi", device="cpu") as tts:
-        result = tts.synthesize(
+    with get_engine("xtts-hindi", device=default_device()) as tts:
+        result = cached_synthesize(
+            tts,
             text=hindi_text,
             output_path="output_context.wav",
             language="hi"
@@ -67,11 +66,11 @@ def example_batch_synthesis():
         "तीसरा वाक्य।"
     ]
     
-    tts = get_tts_engine("xtts-hindi", device="cpu")
-    tts.initialize()
+    tts = get_engine("xtts-hindi", device=default_device())
     
     output_dir = Path("batch_output")
-    output_paths = tts.synthesize_batch(
+    output_paths = synthesize_batch_unique(
+        tts,
         texts=hindi_texts,
         output_dir=output_dir,
         language="hi"
@@ -110,8 +109,7 @@ def example_voice_cloning():
         print("  - Duration: 3-10 seconds")
         return
     
-    tts = get_tts_engine("xtts-hindi", device="cpu")
-    tts.initialize()
+    tts = get_engine("xtts-hindi", device=default_device())
     
     hindi_text = "क्या प्रेम कर्तव्य से बड़ा है? कच और देवयानी की यह कथा हमें धर्म और त्याग का सही अर्थ सिखाती है। प्राचीन काल की बात है, जब देवताओं और असुरों के बीच भीषण संग्राम चल रहा था। असुरों के गुरु शुक्राचार्य के पास 'संजीवनी विद्या' थी, जिससे वे मृत असुरों को पुनर्जीवित कर देते थे।"
     output_path = "output_my_voice.wav"
@@ -119,7 +117,8 @@ def example_voice_cloning():
     print(f"\nUsing voice file: {speaker_wav}")
     print(f"Synthesizing: {hindi_text}")
     
-    result = tts.synthesize(
+    result = cached_synthesize(
+        tts,
         text=hindi_text,
         output_path=output_path,
         speaker_wav=speaker_wav,  # Your voice file
@@ -138,7 +137,7 @@ def example_direct_import():
     
     from tts_playground.xtts_hindi import XTTSHindi
     
-    tts = XTTSHindi(device="cpu")
+    tts = XTTSHindi(device=default_device())
     tts.initialize()
     
     hindi_text = "यह सीधे आयात का उदाहरण है।"
@@ -157,6 +156,9 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
+        # Fetch the model files in parallel before the first example loads them
+        prefetch("Abhinay45/XTTS-Hindi-finetuned")
+        
         # Run examples
         #example_basic_usage()
         #example_context_manager()
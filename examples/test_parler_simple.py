@@ -3,10 +3,9 @@ Test Indic Parler TTS with simple descriptions
 Based on HuggingFace model card examples
 """
 
-from tts_playground import get_tts_engine
+from _common import get_engine
 
-tts = get_tts_engine("indic-parler", device="cpu")
-tts.initialize()
+tts = get_engine("indic-parler", device="cpu")
 
 # Simple test with minimal description
 tests = [
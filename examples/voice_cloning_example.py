@@ -5,7 +5,7 @@ This example shows how to use your own recorded voice for TTS synthesis
 
 import os
 from pathlib import Path
-from tts_playground import get_tts_engine
+from _common import get_engine
 
 # Ensure HF_TOKEN is set
 if not os.getenv("HF_TOKEN"):
@@ -34,13 +34,14 @@ def clone_voice_with_custom_file():
     output_file = "output_my_voice.wav"
     # ==========================
     
-    # Check if voice file exists
-    voice_path = Path(your_voice_file)
-    if not voice_path.exists():
+    # Resolve once; the same absolute path is reused below and keeps the
+    # engine's speaker-latent cache key stable
+    voice_path = Path(your_voice_file).resolve()
+    if not voice_path.is_file():
         print("=" * 60)
         print("Voice file not found!")
         print("=" * 60)
-        print(f"\nExpected file: {voice_path.absolute()}")
+        print(f"\nExpected file: {voice_path}")
         print("\nPlease:")
         print("1. Record your voice (3-10 seconds of Hindi speech)")
         print("2. Save it as a .wav, .mp3, or .flac file")
@@ -56,14 +57,13 @@ def clone_voice_with_custom_file():
     print("=" * 60)
     print("Voice Cloning with Custom Voice File")
     print("=" * 60)
-    print(f"\nVoice file: {voice_path.absolute()}")
+    print(f"\nVoice file: {voice_path}")
     print(f"Text to synthesize: {hindi_text}")
     print(f"Output file: {output_file}")
     
     # Create TTS engine
     print("\nInitializing TTS engine...")
-    tts = get_tts_engine("xtts-hindi", device="cpu")
-    tts.initialize()
+    tts = get_engine("xtts-hindi", device="cpu")
     
     # Synthesize speech using your voice
     print("\nSynthesizing speech with your voice...")
@@ -91,8 +91,8 @@ def clone_voice_multiple_texts():
         "तीसरा वाक्य भी मेरी आवाज़ की तरह लगेगा।"
     ]
     
-    voice_path = Path(your_voice_file)
-    if not voice_path.exists():
+    voice_path = Path(your_voice_file).resolve()
+    if not voice_path.is_file():
         print(f"Voice file not found: {voice_path}")
         print("Please update 'your_voice_file' variable")
         return
@@ -101,13 +101,13 @@ def clone_voice_multiple_texts():
     print("Batch Voice Cloning")
     print("=" * 60)
     
-    tts = get_tts_engine("xtts-hindi", device="cpu")
-    tts.initialize()
+    tts = get_engine("xtts-hindi", device="cpu")
     
     output_dir = Path("my_voice_outputs")
     output_dir.mkdir(exist_ok=True)
     
     print(f"\nGenerating {len(texts)} audio files with your voice...")
+    speaker_wav = str(voice_path)
     
     for i, text in enumerate(texts, 1):
         output_path = output_dir / f"my_voice_{i:02d}.wav"
@@ -116,7 +116,7 @@ def clone_voice_multiple_texts():
         result = tts.synthesize(
             text=text,
             output_path=str(output_path),
-            speaker_wav=str(voice_path),
+            speaker_wav=speaker_wav,
             language="hi"
         )
         
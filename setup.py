@@ -19,15 +19,43 @@ setup(
     author_email="your.email@example.com",
     url="https://github.com/yourusername/tts-playground",
     packages=find_packages(),
+    # Engine libraries pin conflicting versions (e.g. XTTS needs transformers
+    # <4.40, VibeVoice >=4.40), so each engine is an extra installed into its
+    # own environment: pip install -e .[kokoro]
     install_requires=[
-        "TTS>=0.22.0",
-        "torch>=2.0.0",
-        "torchaudio>=2.0.0",
         "numpy>=1.24.0",
         "soundfile>=0.12.0",
         "huggingface-hub>=0.19.0",
-        "transformers>=4.35.0",
     ],
+    extras_require={
+        "xtts": [
+            "TTS>=0.22.0",
+            "torch>=2.0.0",
+            "torchaudio>=2.0.0",
+            "transformers>=4.35.0,<4.40.0",
+        ],
+        "parler": [
+            "parler-tts==0.2.3",
+            "torch>=2.0.0",
+            "torchaudio>=2.0.0",
+        ],
+        "kokoro": [
+            "kokoro>=0.9.2",
+            "misaki[hi]>=0.9.1",
+            "torch>=2.0.0",
+        ],
+        "f5": [
+            "f5-tts>=1.1.0",
+        ],
+        "vibevoice": [
+            "vibevoice @ git+https://github.com/vibevoice-community/VibeVoice.git",
+            "torch>=2.0.0",
+            "transformers>=4.40.0",
+            "accelerate>=0.25.0",
+            "scipy>=1.10.0",
+            "librosa>=0.10.0",
+        ],
+    },
     python_requires=">=3.9",  # XTTS requires <3.12, but Indri works with 3.12+
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -0,0 +1,124 @@
+"""
+Audio helpers shared by TTS engines
+"""
+
+import struct
+import threading
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """
+    Build a RIFF/WAVE header for streaming PCM audio
+
+    The RIFF and data chunk sizes are set to 0xFFFFFFFF because the total
+    length is not known up front; players treat this as "read until EOF".
+    """
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                sample_rate * block_align, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+class BufferPool:
+    """
+    Reusable numpy scratch buffers, bucketed by power-of-two length
+
+    acquire(n) returns an n-sample view of a pooled array; hand it back with
+    release() once its contents have been consumed. Requests longer than
+    max_samples get a fresh array that is never pooled.
+    """
+
+    def __init__(self, dtype: str, max_samples: int = 1 << 22, max_per_bucket: int = 4):
+        self.dtype = dtype
+        self.max_samples = max_samples
+        self.max_per_bucket = max_per_bucket
+        self._free = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(n: int) -> int:
+        return max(1024, 1 << (n - 1).bit_length())
+
+    def acquire(self, n: int):
+        """Return a length-n buffer with undefined contents"""
+        import numpy as np
+
+        bucket = self._bucket(n)
+        if bucket > self.max_samples:
+            return np.empty(n, dtype=self.dtype)
+        with self._lock:
+            free = self._free.get(bucket)
+            buf = free.pop() if free else None
+        if buf is None:
+            buf = np.empty(bucket, dtype=self.dtype)
+        return buf[:n]
+
+    def release(self, buf):
+        """Return a buffer obtained from acquire() to the pool"""
+        base = buf if buf.base is None else buf.base
+        size = base.shape[0]
+        if size > self.max_samples or size != self._bucket(size) or base.dtype != self.dtype:
+            return
+        with self._lock:
+            free = self._free.setdefault(size, [])
+            if len(free) < self.max_per_bucket:
+                free.append(base)
+
+
+FLOAT32_POOL = BufferPool("float32")
+INT16_POOL = BufferPool("<i2")
+
+
+def _convert_pcm16(samples, pcm):
+    """Clip, scale and cast float samples into the int16 array pcm"""
+    import numpy as np
+
+    scratch = FLOAT32_POOL.acquire(samples.size).reshape(samples.shape)
+    try:
+        np.clip(samples, -1.0, 1.0, out=scratch)
+        np.multiply(scratch, 32767, out=scratch)
+        np.copyto(pcm, scratch, casting="unsafe")
+    finally:
+        FLOAT32_POOL.release(scratch)
+
+
+def pcm16_bytes(audio) -> bytes:
+    """Convert a float waveform in [-1, 1] (numpy array or tensor) to 16-bit PCM bytes"""
+    import numpy as np
+
+    if hasattr(audio, "detach"):
+        audio = audio.detach().cpu().numpy()
+    samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+    # Streaming calls this once per chunk, so the float and int16 scratch
+    # arrays are pooled rather than allocated per call
+    pcm = INT16_POOL.acquire(samples.size)
+    try:
+        _convert_pcm16(samples, pcm)
+        return pcm.tobytes()
+    finally:
+        INT16_POOL.release(pcm)
+
+
+def write_pcm16(file, audio, sample_rate: int, **kwargs):
+    """
+    Write a float waveform in [-1, 1] as a 16-bit PCM file via soundfile
+
+    The conversion runs as whole-array numpy ufuncs into pooled buffers, and
+    out-of-range samples are clipped rather than wrapped by libsndfile.
+    file may be a path or a binary file object (pass format= for the latter).
+    """
+    import numpy as np
+    import soundfile as sf
+
+    if hasattr(audio, "detach"):
+        audio = audio.detach().cpu().numpy()
+    samples = np.asarray(audio, dtype=np.float32)
+    pcm = INT16_POOL.acquire(samples.size).reshape(samples.shape)
+    try:
+        _convert_pcm16(samples, pcm)
+        sf.write(file, pcm, sample_rate, subtype="PCM_16", **kwargs)
+    finally:
+        INT16_POOL.release(pcm)
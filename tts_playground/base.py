@@ -3,31 +3,56 @@ Base interface for TTS engines
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from typing import Iterator, List, Optional, Union
 from pathlib import Path
 
 
 class TTSBase(ABC):
     """Base class for all TTS engines"""
     
-    def __init__(self, model_name: str, device: str = "cpu"):
+    # Precisions an engine can load its weights in; None keeps the engine default
+    SUPPORTED_DTYPES = ("fp32", "fp16", "bf16", "int8")
+    
+    # Whether int8 also works off CPU; the default int8 path (_apply_dtype) is CPU only
+    GPU_INT8 = False
+    
+    def __init__(self, model_name: str, device: str = "cpu", dtype: Optional[str] = None):
         """
         Initialize TTS engine
         
         Args:
             model_name: Name/identifier of the model
             device: Device to run on ('cpu' or 'cuda')
+            dtype: Weight precision ('fp32', 'fp16', 'bf16' or 'int8'), None for default
         """
+        if dtype is not None and dtype not in self.SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported dtype for {type(self).__name__}: {dtype}. "
+                f"Choose from: {', '.join(self.SUPPORTED_DTYPES)}"
+            )
+        if dtype == "int8" and device != "cpu" and not self.GPU_INT8:
+            raise ValueError(
+                f"int8 for {type(self).__name__} is dynamic quantization, which runs "
+                f"on CPU only. Use device='cpu' or another dtype (got device={device!r})"
+            )
         self.model_name = model_name
         self.device = device
+        self.dtype = dtype
         self._model = None
         self._initialized = False
+        self._made_dirs = set()
     
     @abstractmethod
     def initialize(self):
         """Initialize the TTS model"""
         pass
     
+    def _ensure_dir(self, directory: Path):
+        """Create directory (and parents) unless this engine already has"""
+        if directory not in self._made_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(directory)
+    
     @abstractmethod
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None, 
                    **kwargs) -> Union[bytes, str]:
@@ -44,6 +69,44 @@ class TTSBase(ABC):
         """
         pass
     
+    def synthesize_many(self, texts: List[str], output_paths: List[Union[str, Path]],
+                        **kwargs) -> list:
+        """
+        Synthesize texts that share the same parameters, one output path each
+        
+        Returns one entry per text: the saved path, or the Exception that text
+        raised. Engines with batched inference override this to run the texts
+        together.
+        """
+        results = []
+        for text, output_path in zip(texts, output_paths):
+            try:
+                results.append(self.synthesize(text=text, output_path=output_path, **kwargs))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def stream_synthesize(self, text: str, chunk_size: int = 64 * 1024,
+                          **kwargs) -> Iterator[bytes]:
+        """
+        Synthesize speech and yield WAV bytes in chunks
+        
+        Engines that generate audio incrementally override this to yield a
+        streaming WAV header followed by PCM frames as they are produced.
+        The default synthesizes the whole clip before yielding it.
+        
+        Args:
+            text: Text to convert to speech
+            chunk_size: Size of each yielded chunk in bytes
+            **kwargs: Additional parameters specific to the TTS engine
+            
+        Yields:
+            Consecutive chunks of a WAV file
+        """
+        audio_bytes = self.synthesize(text, output_path=None, **kwargs)
+        for start in range(0, len(audio_bytes), chunk_size):
+            yield audio_bytes[start:start + chunk_size]
+    
     @abstractmethod
     def get_supported_languages(self) -> list:
         """Get list of supported languages"""
@@ -53,6 +116,31 @@ class TTSBase(ABC):
         """Check if model is initialized"""
         return self._initialized
     
+    def _apply_dtype(self, module):
+        """
+        Cast or quantize a torch module to the engine's dtype
+        
+        int8 uses dynamic quantization of Linear layers, which runs on CPU only.
+        """
+        if self.dtype in (None, "fp32"):
+            return module
+        
+        import torch
+        
+        if self.dtype == "int8":
+            param = next(module.parameters(), None)
+            if param is not None and param.device.type != "cpu":
+                raise ValueError(
+                    f"int8 dynamic quantization runs on CPU only, but the model is on {param.device}"
+                )
+            return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+        return module.to({"fp16": torch.float16, "bf16": torch.bfloat16}[self.dtype])
+    
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        self._model = None
+        self._initialized = False
+    
     def __enter__(self):
         """Context manager entry"""
         if not self._initialized:
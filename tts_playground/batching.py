@@ -0,0 +1,142 @@
+"""
+Dynamic request batching for serving TTS engines
+Groups concurrent synthesis requests that share a model and parameters
+"""
+
+import asyncio
+from bisect import bisect_left
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+# (upper bound on text length, max batch size, max wait in seconds)
+# Short texts are cheap, so they batch wider and flush sooner
+DEFAULT_LENGTH_BUCKETS = (
+    (40, 16, 0.08),
+    (150, 8, 0.12),
+    (400, 4, 0.16),
+    (10_000, 2, 0.2),
+)
+
+
+class BatchScheduler:
+    """
+    Per-key, length-bucketed dynamic batching scheduler
+
+    Requests are queued under a key (typically the model name plus the shared
+    synthesis parameters) and a text-length bucket, so a batch never mixes
+    very short and very long texts. A background task per bucket waits up to
+    the bucket's max wait for more requests to arrive, then hands up to the
+    bucket's max batch size items to ``run_batch`` in a worker thread so the
+    event loop stays free.
+
+    ``run_batch(key, items)`` must return one result per item; an item whose
+    result is an Exception instance fails only that request.
+    """
+
+    def __init__(self, run_batch: Callable[[Hashable, List[Any]], List[Any]],
+                 buckets: Sequence[Tuple[int, int, float]] = DEFAULT_LENGTH_BUCKETS,
+                 max_batch_size: Optional[int] = None,
+                 idle_timeout: float = 60.0,
+                 executor: Optional[Executor] = None,
+                 limiter: Optional[Callable[[Hashable], Any]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            run_batch: Blocking callable that processes a list of items
+            buckets: (max length, max batch size, max wait seconds) per bucket,
+                     sorted by max length; longer items use the last bucket
+            max_batch_size: Optional cap applied to every bucket's batch size
+            idle_timeout: Seconds without traffic before a bucket's worker exits
+            executor: Executor that runs batches (default: the loop's default)
+            limiter: Optional callable returning an async context manager
+                     (e.g. an asyncio.Semaphore) held while a batch for key runs
+        """
+        self.run_batch = run_batch
+        self._limits = [limit for limit, _, _ in buckets]
+        self._bucket_config = [
+            (max(1, min(size, max_batch_size or size)), wait)
+            for _, size, wait in buckets
+        ]
+        self.idle_timeout = idle_timeout
+        self.executor = executor
+        self.limiter = limiter
+        self._queues: Dict[Hashable, asyncio.Queue] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def _bucket_index(self, length: int) -> int:
+        return min(bisect_left(self._limits, length), len(self._limits) - 1)
+
+    async def submit(self, key: Hashable, item: Any, length: int = 0) -> Any:
+        """Queue an item of the given text length under key and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        bucket = self._bucket_index(length)
+        queue_key = (key, bucket)
+        queue = self._queues.get(queue_key)
+        if queue is None:
+            queue = self._queues[queue_key] = asyncio.Queue()
+            self._tasks[queue_key] = asyncio.create_task(
+                self._worker(queue_key, queue, *self._bucket_config[bucket])
+            )
+        queue.put_nowait((item, future))
+        return await future
+
+    async def _worker(self, queue_key: Tuple[Hashable, int], queue: asyncio.Queue,
+                      max_batch_size: int, max_wait: float):
+        key = queue_key[0]
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                first = await asyncio.wait_for(queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    # No await between this check and removal, so no submit can
+                    # slip an item into a queue nobody is draining
+                    del self._queues[queue_key]
+                    del self._tasks[queue_key]
+                    return
+                continue
+
+            batch = [first]
+            deadline = loop.time() + max_wait
+            while len(batch) < max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            try:
+                # Items keep queueing (and batching) while a batch waits on the limiter
+                limit = self.limiter(key) if self.limiter else None
+                if limit is None:
+                    results = await loop.run_in_executor(self.executor, self.run_batch, key, items)
+                else:
+                    async with limit:
+                        results = await loop.run_in_executor(self.executor, self.run_batch, key, items)
+            except Exception as e:
+                results = [e] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def shutdown(self):
+        """Cancel all worker tasks"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queues.clear()
+        self._tasks.clear()
@@ -3,14 +3,81 @@ F5-Hindi TTS Implementation
 Voice cloning TTS for Hindi using SPRINGLab/F5-Hindi-24KHz
 """
 
+import functools
+import io
 import os
-import soundfile as sf
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Union, List
 
+from tts_playground.audio import write_pcm16
 from tts_playground.base import TTSBase
 
 
+# Mel-frame lengths (~94 frames per second at 24 kHz) used to report the
+# shapes batched sampling runs at
+DURATION_BUCKETS = (128, 256, 512, 1024, 2048)
+
+
+def _bucket_len(n: int, buckets=DURATION_BUCKETS) -> int:
+    """Smallest bucket >= n, or n itself when it exceeds every bucket"""
+    for bucket in buckets:
+        if n <= bucket:
+            return bucket
+    return n
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_hub_download(repo_id: str, filename: str) -> str:
+    """
+    Resolve a Hub file, preferring the local cache over a network round-trip
+    
+    hf_hub_download checks the remote revision even when the file is cached;
+    the local lookup skips that on warm starts, and the result is memoized so
+    later engine instances in the process skip the lookup as well.
+    """
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.utils import LocalEntryNotFoundError
+    
+    try:
+        return hf_hub_download(repo_id=repo_id, filename=filename, local_files_only=True)
+    except LocalEntryNotFoundError:
+        return hf_hub_download(repo_id=repo_id, filename=filename)
+
+
+def _stitch(waves: list, sample_rate: int, cross_fade_duration: float):
+    """
+    Join generated chunks with F5's linear cross-fade in one float32 array
+    
+    F5 grows the result with np.concatenate at every boundary, copying the
+    whole clip once per chunk; here the final length is computed first and
+    each chunk is copied in exactly once.
+    """
+    import numpy as np
+    
+    fade = int(cross_fade_duration * sample_rate)
+    overlaps = []
+    length = 0
+    for i, wave in enumerate(waves):
+        overlap = 0 if i == 0 else max(0, min(fade, length, len(wave)))
+        overlaps.append(overlap)
+        length += len(wave) - overlap
+    
+    out = np.empty(length, dtype=np.float32)
+    pos = 0
+    for wave, overlap in zip(waves, overlaps):
+        if overlap:
+            fade_in = np.linspace(0, 1, overlap, dtype=np.float32)
+            tail = out[pos - overlap:pos]
+            tail *= 1 - fade_in
+            tail += wave[:overlap] * fade_in
+        out[pos:pos + len(wave) - overlap] = wave[overlap:]
+        pos += len(wave) - overlap
+    return out
+
+
 class F5HindiTTS(TTSBase):
     """
     F5-Hindi TTS Engine (Voice Cloning)
@@ -24,18 +91,55 @@ class F5HindiTTS(TTSBase):
         "hi": "Hindi",
     }
     
+    # CFM.sample casts the reference mel to the weights' dtype and the vocoder
+    # is a separate fp32 model, so half precision only touches the transformer
+    SUPPORTED_DTYPES = ("fp32", "fp16", "bf16", "int8")
+    
+    # Number of distinct (reference clip, transcript) pairs kept preprocessed
+    REF_CACHE_SIZE = 16
+    
+    # Number of synthesized waveforms kept for repeated phrases (~0.5 MB per
+    # 5 s clip at 24 kHz float32)
+    SYNTH_CACHE_SIZE = 32
+    
+    # Chunks of one long text sampled per forward pass; bounds GPU memory
+    # however long the text is
+    CHUNK_BATCH_SIZE = 4
+    
+    # Generation options infer_process takes directly; anything else
+    # (remove_silence, file_spec, ...) goes through F5TTS.infer
+    _PROCESS_KWARGS = frozenset({
+        "target_rms", "cross_fade_duration", "sway_sampling_coef", "cfg_strength",
+        "nfe_step", "fix_duration", "seed", "show_info", "progress",
+    })
+    
     def __init__(self, model_name: str = "SPRINGLab/F5-Hindi-24KHz",
-                 device: str = "cpu"):
+                 device: str = "cpu", dtype: Optional[str] = None):
         """
         Initialize F5-Hindi TTS engine
         
         Args:
             model_name: HuggingFace model name
             device: Device to run on ('cpu' or 'cuda')
+            dtype: Weight precision ('fp32', 'fp16', 'bf16' or 'int8'), None for
+                   F5's default (fp16 on CUDA GPUs from Volta on, else fp32)
         """
-        super().__init__(model_name, device)
+        super().__init__(model_name, device, dtype)
         self._tts = None
         self._default_speaker_wav = None
+        
+        # Clipped reference audio and transcript keyed by file version and ref_text
+        self._ref_cache = OrderedDict()
+        
+        # Waveforms keyed by text, reference and generation options
+        self._synth_cache = OrderedDict()
+        
+        # How many synthesize_batch forward passes ran at each padded length
+        # bucket; useful for choosing batch_size for a workload
+        self.batch_shape_counts = Counter()
+        
+        # The model and both caches are not safe to use from two threads at once
+        self._infer_lock = threading.Lock()
 
     def initialize(self):
         """Initialize the F5-Hindi TTS model"""
@@ -47,20 +151,13 @@ class F5HindiTTS(TTSBase):
             print(f"Device: {self.device}")
             
             from f5_tts.api import F5TTS
-            from huggingface_hub import hf_hub_download
             
             # Download the model checkpoint from HuggingFace
             print("Downloading model from HuggingFace...")
-            ckpt_path = hf_hub_download(
-                repo_id=self.model_name,
-                filename="model_2500000.safetensors"
-            )
+            ckpt_path = _cached_hub_download(self.model_name, "model_2500000.safetensors")
             
             # Download vocab file
-            vocab_path = hf_hub_download(
-                repo_id=self.model_name,
-                filename="vocab.txt"
-            )
+            vocab_path = _cached_hub_download(self.model_name, "vocab.txt")
             
             print(f"Model checkpoint: {ckpt_path}")
             print(f"Vocab file: {vocab_path}")
@@ -74,6 +171,12 @@ class F5HindiTTS(TTSBase):
                 vocab_file=vocab_path,
                 device=self.device if self.device != "cpu" else None
             )
+            if self.dtype == "fp32":
+                # F5 loads fp16 weights on recent GPUs unless told otherwise
+                self._tts.ema_model = self._tts.ema_model.float()
+            self._tts.ema_model = self._apply_dtype(self._tts.ema_model)
+            if self.device != "cpu" and os.getenv("F5_COMPILE") == "1":
+                self._compile_transformer()
             
             # Look for default speaker reference in workspace
             default_refs = ["my_voice.wav", "reference.wav", "speaker.wav"]
@@ -89,11 +192,169 @@ class F5HindiTTS(TTSBase):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize F5-Hindi TTS: {str(e)}")
 
+    def _compile_transformer(self):
+        """
+        Compile the DiT transformer that every ODE step calls
+        
+        Inductor's FX graph cache is persisted (TORCHINDUCTOR_CACHE_DIR,
+        default ~/.cache/f5_inductor) so later runs skip most of the compile
+        time. dynamic=True keeps one graph for all sequence lengths instead of
+        recompiling per length.
+        """
+        import torch
+        import torch._inductor.config
+        
+        torch._inductor.config.fx_graph_cache = True
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.expanduser("~/.cache/f5_inductor"))
+        model = self._tts.ema_model
+        model.transformer = torch.compile(model.transformer, dynamic=True, fullgraph=False)
+        print("Compiled F5 transformer with torch.compile")
+
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        self._tts = None
+        self._ref_cache.clear()
+        self._synth_cache.clear()
+        super().unload()
+
+    def _prepare_reference(self, ref_audio: Union[str, Path], ref_text: Optional[str]):
+        """
+        Return (clipped reference file, reference text, (waveform, sample_rate))
+        
+        Clipping, silence trimming and, without ref_text, ASR transcription run
+        once per file version; F5 itself would re-read and hash the whole clip
+        on every call. The clipped audio is also decoded once here, so
+        inference works from the in-memory waveform instead of re-reading the
+        file. It is downmixed, resampled to the model rate and moved to the
+        model's device once too, so repeat calls skip the host-to-device copy.
+        Editing the file changes its size/mtime, so it is reprocessed.
+        """
+        import soundfile as sf
+        import torch
+        import torchaudio
+        from f5_tts.infer.utils_infer import preprocess_ref_audio_text, target_sample_rate
+        
+        path = Path(ref_audio).resolve()
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns, ref_text or "")
+        hit = self._ref_cache.get(key)
+        if hit is None:
+            ref_file, ref_text_processed = preprocess_ref_audio_text(str(path), ref_text or "")
+            data, sr = sf.read(ref_file, dtype="float32", always_2d=True)
+            audio = torch.from_numpy(data.mean(axis=1)).unsqueeze(0)
+            if sr != target_sample_rate:
+                audio = torchaudio.transforms.Resample(sr, target_sample_rate)(audio)
+            if str(self._tts.device).startswith("cuda"):
+                audio = audio.pin_memory().to(self._tts.device, non_blocking=True)
+            else:
+                audio = audio.to(self._tts.device)
+            ref_wave = (audio.contiguous(), target_sample_rate)
+            hit = self._ref_cache[key] = (ref_file, ref_text_processed, ref_wave)
+            if len(self._ref_cache) > self.REF_CACHE_SIZE:
+                self._ref_cache.popitem(last=False)
+        else:
+            self._ref_cache.move_to_end(key)
+        return hit
+
+    def synthesize_raw(self, text: str, speaker_wav: Optional[Union[str, Path]] = None,
+                       ref_text: Optional[str] = None, speed: float = 1.0,
+                       disable_cache: bool = False, **kwargs):
+        """
+        Synthesize speech and return (waveform, sample_rate) without writing a file
+        
+        Lets callers overlap the next generation with writing the previous clip.
+        Repeated requests are served from an LRU of recent waveforms unless
+        disable_cache is set; the returned array must not be modified in place.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        ref_audio = speaker_wav or self._default_speaker_wav
+        if not ref_audio:
+            raise ValueError(
+                "F5-Hindi requires a speaker reference audio file (speaker_wav). "
+                "Provide speaker_wav parameter or place 'my_voice.wav' in workspace."
+            )
+        
+        if not set(kwargs) <= self._PROCESS_KWARGS:
+            # Without file_wave, infer returns (wav, sample_rate, spectrogram)
+            with self._infer_lock:
+                wav, sample_rate, _ = self._tts.infer(
+                    ref_file=str(ref_audio),
+                    ref_text=ref_text or "",
+                    gen_text=text,
+                    speed=speed,
+                    **kwargs
+                )
+            return wav, sample_rate
+        
+        from f5_tts.infer.utils_infer import chunk_text, infer_batch_process
+        
+        with self._infer_lock:
+            ref_file, ref_text_processed, ref_wave = self._prepare_reference(ref_audio, ref_text)
+            
+            key = None
+            if not disable_cache:
+                key = (text, ref_file, ref_text_processed, speed, tuple(sorted(kwargs.items())))
+                try:
+                    hit = self._synth_cache.get(key)
+                except TypeError:
+                    key = hit = None
+                if hit is not None:
+                    self._synth_cache.move_to_end(key)
+                    return hit
+            
+            seed = kwargs.pop("seed", None)
+            if seed is not None:
+                from f5_tts.model.utils import seed_everything
+                seed_everything(seed)
+            
+            kwargs.pop("show_info", None)
+            
+            # Same chunking as F5's infer_process, but from the decoded reference
+            ref_seconds = ref_wave[0].shape[-1] / ref_wave[1]
+            max_chars = int(len(ref_text_processed.encode("utf-8")) / ref_seconds * (22 - ref_seconds) * speed)
+            chunks = chunk_text(text, max_chars=max_chars)
+            
+            if len(chunks) > 1 and set(kwargs) <= self._BATCH_KWARGS | {"cross_fade_duration"}:
+                # Chunks of a long text share the reference, so they are sampled
+                # CHUNK_BATCH_SIZE at a time and cross-faded into a single
+                # preallocated array
+                cross_fade_duration = kwargs.pop("cross_fade_duration", 0.15)
+                waves = []
+                for start in range(0, len(chunks), self.CHUNK_BATCH_SIZE):
+                    group, sample_rate = self._infer_batch(
+                        ref_wave, ref_text_processed, chunks[start:start + self.CHUNK_BATCH_SIZE],
+                        speed=speed, **kwargs
+                    )
+                    waves.extend(group)
+                wav = _stitch(waves, sample_rate, cross_fade_duration)
+            else:
+                wav, sample_rate, _ = next(infer_batch_process(
+                    ref_wave,
+                    ref_text_processed,
+                    chunks,
+                    self._tts.ema_model,
+                    self._tts.vocoder,
+                    mel_spec_type=self._tts.mel_spec_type,
+                    speed=speed,
+                    device=self._tts.device,
+                    **kwargs
+                ))
+            
+            if key is not None:
+                self._synth_cache[key] = (wav, sample_rate)
+                if len(self._synth_cache) > self.SYNTH_CACHE_SIZE:
+                    self._synth_cache.popitem(last=False)
+        
+        return wav, sample_rate
+
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None,
                    speaker_wav: Optional[Union[str, Path]] = None,
                    ref_text: Optional[str] = None,
                    use_default_output_dir: bool = True,
                    speed: float = 1.0,
+                   disable_cache: bool = False,
                    **kwargs) -> Union[bytes, str]:
         """
         Synthesize speech from text using voice cloning
@@ -105,6 +366,7 @@ class F5HindiTTS(TTSBase):
             ref_text: Transcript of the reference audio (optional, improves quality)
             use_default_output_dir: Use output/f5_hindi/ folder structure
             speed: Speech speed (default 1.0)
+            disable_cache: Always run the model, bypassing the waveform cache
             **kwargs: Additional generation parameters
             
         Returns:
@@ -122,6 +384,24 @@ class F5HindiTTS(TTSBase):
                     "Provide speaker_wav parameter or place 'my_voice.wav' in workspace."
                 )
             
+            if set(kwargs) <= self._PROCESS_KWARGS:
+                wav, sample_rate = self.synthesize_raw(
+                    text, speaker_wav=ref_audio, ref_text=ref_text, speed=speed,
+                    disable_cache=disable_cache, **kwargs
+                )
+                if output_path is None:
+                    # Encode in memory; no temp file round-trip
+                    buffer = io.BytesIO()
+                    write_pcm16(buffer, wav, sample_rate, format="WAV")
+                    return buffer.getvalue()
+                
+                output_path = Path(output_path)
+                if use_default_output_dir and not output_path.is_absolute():
+                    output_path = Path("output") / "f5_hindi" / output_path
+                self._ensure_dir(output_path.parent)
+                write_pcm16(str(output_path), wav, sample_rate)
+                return str(output_path)
+            
             # Prepare output path
             if output_path is None:
                 output_path = "temp_output.wav"
@@ -130,19 +410,20 @@ class F5HindiTTS(TTSBase):
                 output_path = Path(output_path)
                 if use_default_output_dir and not output_path.is_absolute():
                     output_path = Path("output") / "f5_hindi" / output_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(output_path.parent)
                 return_bytes = False
             
-            # Generate audio using F5-TTS
-            # The infer method saves directly to file via file_wave parameter
-            self._tts.infer(
-                ref_file=str(ref_audio),
-                ref_text=ref_text or "",
-                gen_text=text,
-                file_wave=str(output_path),
-                speed=speed,
-                **kwargs
-            )
+            # Options like remove_silence post-process a file, so F5 writes one
+            # via the file_wave parameter
+            with self._infer_lock:
+                self._tts.infer(
+                    ref_file=str(ref_audio),
+                    ref_text=ref_text or "",
+                    gen_text=text,
+                    file_wave=str(output_path),
+                    speed=speed,
+                    **kwargs
+                )
             
             if return_bytes:
                 with open(output_path, "rb") as f:
@@ -163,37 +444,195 @@ class F5HindiTTS(TTSBase):
         """Get dictionary mapping language codes to names"""
         return self.SUPPORTED_LANGUAGES.copy()
     
+    # Generation options the batched sampler understands; anything else
+    # (fix_duration, seed, remove_silence, ...) takes the per-item path
+    _BATCH_KWARGS = frozenset({"speed", "nfe_step", "cfg_strength", "sway_sampling_coef", "target_rms"})
+    
+    def _infer_batch(self, ref_wave, ref_text: str, texts: List[str],
+                     speed: float = 1.0, nfe_step: int = 32, cfg_strength: float = 2.0,
+                     sway_sampling_coef: float = -1.0, target_rms: float = 0.1):
+        """
+        Sample several single-chunk texts against one reference in one forward pass
+        
+        Returns (list of waveforms, sample_rate).
+        
+        Mirrors F5's per-chunk inference, but stacks the texts into a padded
+        batch: the reference mel is repeated along the batch axis and each
+        row gets its own duration, which the sampler turns into a length mask.
+        """
+        import torch
+        from f5_tts.infer.utils_infer import convert_char_to_pinyin, hop_length
+        
+        # The cached reference is already mono, at the model rate and on device
+        audio, sample_rate = ref_wave
+        rms = torch.sqrt(torch.mean(torch.square(audio)))
+        if rms < target_rms:
+            audio = audio * target_rms / rms
+        
+        if len(ref_text[-1].encode("utf-8")) == 1:
+            ref_text = ref_text + " "
+        ref_len = audio.shape[-1] // hop_length
+        ref_text_len = len(ref_text.encode("utf-8"))
+        
+        final_texts = convert_char_to_pinyin([ref_text + text for text in texts])
+        durations = []
+        for text, chars in zip(texts, final_texts):
+            text_len = len(text.encode("utf-8"))
+            local_speed = 0.3 if text_len < 10 else speed
+            duration = ref_len + int(ref_len / ref_text_len * text_len / local_speed)
+            # The sampler never generates fewer frames than text or prompt length
+            durations.append(max(duration, len(chars) + 1, ref_len + 1))
+        self.batch_shape_counts[_bucket_len(max(durations))] += 1
+        
+        model = self._tts.ema_model
+        with torch.inference_mode():
+            cond = model.mel_spec(audio).permute(0, 2, 1)
+            batch = len(texts)
+            generated, _ = model.sample(
+                cond=cond.expand(batch, -1, -1),
+                text=final_texts,
+                duration=torch.tensor(durations, device=audio.device),
+                lens=torch.full((batch,), cond.shape[1], device=audio.device, dtype=torch.long),
+                steps=nfe_step,
+                cfg_strength=cfg_strength,
+                sway_sampling_coef=sway_sampling_coef,
+            )
+            generated = generated.to(torch.float32)
+            
+            waves = []
+            for mel, duration in zip(generated, durations):
+                # Slice off the prompt and this row's padding before vocoding
+                mel = mel[ref_len:duration].T.unsqueeze(0)
+                if self._tts.mel_spec_type == "vocos":
+                    wave = self._tts.vocoder.decode(mel)
+                else:
+                    wave = self._tts.vocoder(mel)
+                if rms < target_rms:
+                    wave = wave * rms / target_rms
+                waves.append(wave.squeeze().cpu().numpy())
+        
+        return waves, sample_rate
+    
     def synthesize_batch(self, texts: List[str], output_dir: Union[str, Path],
                         speaker_wav: Optional[Union[str, Path]] = None,
                         ref_text: Optional[str] = None,
+                        batch_size: int = 4,
                         **kwargs) -> List[str]:
         """
         Synthesize multiple texts in batch
         
+        Texts that fit in a single F5 chunk are sampled batch_size at a time;
+        longer texts (which F5 splits and cross-fades) use synthesize().
+        
         Args:
             texts: List of texts to synthesize
             output_dir: Directory to save output files
             speaker_wav: Reference speaker audio (required)
             ref_text: Transcript of reference audio (optional)
+            batch_size: Number of texts sampled per forward pass
             **kwargs: Additional parameters
             
         Returns:
             List of paths to generated audio files
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_paths = []
-        for i, text in enumerate(texts):
-            output_path = output_dir / f"output_{i+1:04d}.wav"
-            result = self.synthesize(
-                text=text,
-                output_path=output_path,
-                speaker_wav=speaker_wav,
-                ref_text=ref_text,
-                use_default_output_dir=False,
-                **kwargs
-            )
-            output_paths.append(result)
+        self._ensure_dir(output_dir)
+        output_paths = [output_dir / f"output_{i+1:04d}.wav" for i in range(len(texts))]
+        results = self._synthesize_to_paths(texts, output_paths, speaker_wav, ref_text, batch_size, **kwargs)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+    
+    def synthesize_many(self, texts: List[str], output_paths: List[Union[str, Path]],
+                        speaker_wav: Optional[Union[str, Path]] = None,
+                        ref_text: Optional[str] = None,
+                        use_default_output_dir: bool = True,
+                        batch_size: int = 4,
+                        **kwargs) -> list:
+        """Synthesize texts that share parameters to the given paths, sampling them in batches"""
+        paths = []
+        for output_path in output_paths:
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "f5_hindi" / output_path
+            self._ensure_dir(output_path.parent)
+            paths.append(output_path)
+        return self._synthesize_to_paths(texts, paths, speaker_wav, ref_text, batch_size, **kwargs)
+    
+    def _synthesize_to_paths(self, texts: List[str], output_paths: List[Path],
+                             speaker_wav: Optional[Union[str, Path]], ref_text: Optional[str],
+                             batch_size: int, **kwargs) -> list:
+        """
+        Write texts[i] to output_paths[i], batching every text that fits in one chunk
+        
+        Returns one entry per text: its path, or the Exception that text raised.
+        Texts from a batch that fails are retried one at a time with synthesize().
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        results = [None] * len(texts)
+        pending = list(range(len(texts)))
+        ref_audio = speaker_wav or self._default_speaker_wav
+        if ref_audio and batch_size > 1 and set(kwargs) <= self._BATCH_KWARGS:
+            try:
+                from f5_tts.infer.utils_infer import chunk_text
+                
+                with self._infer_lock:
+                    _, ref_text_processed, ref_wave = self._prepare_reference(ref_audio, ref_text)
+            except Exception:
+                # Older f5-tts without the inference utilities, or a reference
+                # that fails to load: the per-item path reports each error
+                batchable = []
+            else:
+                ref_seconds = ref_wave[0].shape[-1] / ref_wave[1]
+                max_chars = int(len(ref_text_processed.encode("utf-8")) / ref_seconds
+                                * (22 - ref_seconds) * kwargs.get("speed", 1.0))
+                batchable = [i for i in pending if len(chunk_text(texts[i], max_chars=max_chars)) == 1]
+                # Durations grow with text length, so batching neighbours in
+                # length order keeps rows close to the batch's padded length
+                batchable.sort(key=lambda i: len(texts[i].encode("utf-8")))
+            
+            # Writes run on worker threads (libsndfile releases the GIL)
+            # while the next batch is sampled
+            sampled = set()
+            with ThreadPoolExecutor(max_workers=min(4, batch_size)) as writer:
+                writes = []
+                for start in range(0, len(batchable), batch_size):
+                    chunk = batchable[start:start + batch_size]
+                    try:
+                        with self._infer_lock:
+                            waves, sample_rate = self._infer_batch(
+                                ref_wave, ref_text_processed, [texts[i] for i in chunk], **kwargs
+                            )
+                    except Exception:
+                        # e.g. one bad text or an OOM; these texts go through
+                        # synthesize() one at a time below
+                        continue
+                    sampled.update(chunk)
+                    for i, wave in zip(chunk, waves):
+                        writes.append((i, writer.submit(write_pcm16, str(output_paths[i]), wave, sample_rate)))
+                for i, write in writes:
+                    try:
+                        write.result()
+                        results[i] = str(output_paths[i])
+                    except Exception as e:
+                        results[i] = e
+            
+            pending = [i for i in pending if i not in sampled]
+        
+        for i in pending:
+            try:
+                results[i] = self.synthesize(
+                    text=texts[i],
+                    output_path=output_paths[i],
+                    speaker_wav=speaker_wav,
+                    ref_text=ref_text,
+                    use_default_output_dir=False,
+                    **kwargs
+                )
+            except Exception as e:
+                results[i] = e
         
-        return output_paths
+        return results
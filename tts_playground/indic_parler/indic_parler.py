@@ -3,15 +3,25 @@ Indic Parler TTS Implementation
 Text-to-speech for 22 Indian languages using ai4bharat/indic-parler-tts
 """
 
+import io
 import os
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
-import soundfile as sf
 from pathlib import Path
 from typing import Optional, Union, List
 
+from tts_playground.audio import write_pcm16
 from tts_playground.base import TTSBase
 
 
+# Loaded models by (model_name, device, dtype, compile_model); entries drop
+# out once no engine instance holds the model
+_MODEL_CACHE = weakref.WeakValueDictionary()
+
+
 class IndicParlerTTS(TTSBase):
     """
     Indic Parler TTS Engine
@@ -47,6 +57,20 @@ class IndicParlerTTS(TTSBase):
         "te": "Telugu",
     }
 
+    # int8/int4 on CUDA are bitsandbytes weight-only quantization; int8 on CPU
+    # is dynamic quantization like the other engines
+    SUPPORTED_DTYPES = ("fp32", "fp16", "bf16", "int8", "int4")
+    GPU_INT8 = True
+    
+    # Decoding budget heuristic: speech rarely runs slower than this many
+    # characters per second, and budgets are rounded up to a multiple of
+    # MAX_NEW_TOKENS_STEP so compiled static-cache shapes stay few
+    MIN_CHARS_PER_SECOND = 8
+    MAX_NEW_TOKENS_STEP = 512
+    
+    # Number of tokenized voice descriptions kept on the device
+    DESCRIPTION_CACHE_SIZE = 16
+    
     # Example voice descriptions
     VOICE_DESCRIPTIONS = {
         "male_calm": "A male speaker with a calm and clear voice.",
@@ -56,7 +80,8 @@ class IndicParlerTTS(TTSBase):
     }
     
     def __init__(self, model_name: str = "ai4bharat/indic-parler-tts",
-                 device: str = "cpu", hf_token: Optional[str] = None):
+                 device: str = "cpu", hf_token: Optional[str] = None,
+                 dtype: Optional[str] = None, compile_model: bool = True):
         """
         Initialize Indic Parler TTS engine
         
@@ -64,17 +89,28 @@ class IndicParlerTTS(TTSBase):
             model_name: HuggingFace model name
             device: Device to run on ('cpu' or 'cuda')
             hf_token: HuggingFace token for gated model access (or set HF_TOKEN env var)
+            dtype: Weight precision ('fp32', 'fp16', 'bf16', 'int8' or 'int4' (GPU
+                   only)), None for bf16 on GPUs that support it and fp32 otherwise
+            compile_model: On CUDA, compile the model's forward with torch.compile
         """
-        super().__init__(model_name, device)
+        super().__init__(model_name, device, dtype)
         self.hf_token = hf_token or os.getenv("HF_TOKEN")
         
         if device == "cpu":
             self.torch_device = torch.device("cpu")
         else:
+            # Growable segments let the caching allocator reuse memory across
+            # generate calls of varying length instead of fragmenting; this
+            # only takes effect if CUDA has not been initialized yet
+            os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
             self.torch_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
         self._tokenizer = None
         self.default_description = "A female speaker with a calm and clear voice."
+        self.compile_model = compile_model
+        
+        # (input_ids, attention_mask) on torch_device, keyed by description
+        self._desc_cache = OrderedDict()
     
     def initialize(self):
         """Initialize the Indic Parler TTS model"""
@@ -85,25 +121,217 @@ class IndicParlerTTS(TTSBase):
             print(f"Loading Indic Parler TTS model: {self.model_name}")
             print(f"Device: {self.torch_device}")
             
-            from parler_tts import ParlerTTSForConditionalGeneration
             from transformers import AutoTokenizer
             
-            self._model = ParlerTTSForConditionalGeneration.from_pretrained(
-                self.model_name,
-                token=self.hf_token
-            ).to(self.torch_device)
+            # is_bf16_supported() also reports emulated bf16 on pre-Ampere GPUs
+            if (self.dtype is None and self.torch_device.type == "cuda"
+                    and torch.cuda.get_device_capability(self.torch_device)[0] >= 8):
+                self.dtype = "bf16"
             
             self._tokenizer = AutoTokenizer.from_pretrained(
                 self.model_name,
                 token=self.hf_token
             )
             
+            # Engines with the same settings share one copy of the weights
+            key = (self.model_name, str(self.torch_device), self.dtype, self.compile_model)
+            self._model = _MODEL_CACHE.get(key)
+            if self._model is None:
+                self._load_model()
+                _MODEL_CACHE[key] = self._model
+            else:
+                print("Reusing already loaded model")
+            
             self._initialized = True
             print("Indic Parler TTS model loaded successfully!")
             
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Indic Parler TTS: {str(e)}")
 
+    def _load_model(self):
+        """Load, cast and (on CUDA) compile or warm up the model"""
+        from parler_tts import ParlerTTSForConditionalGeneration
+        
+        # Half precisions are loaded directly rather than cast after an
+        # fp32 load, which would briefly hold both copies
+        torch_dtype = {"fp16": torch.float16, "bf16": torch.bfloat16}.get(self.dtype, torch.float32)
+        quantization_config = self._quantization_config()
+        if quantization_config is not None:
+            # Quantized weights are placed on the GPU by from_pretrained
+            # and cannot be moved or cast afterwards
+            self._model = ParlerTTSForConditionalGeneration.from_pretrained(
+                self.model_name,
+                token=self.hf_token,
+                attn_implementation="sdpa",
+                quantization_config=quantization_config,
+                device_map={"": self.torch_device}
+            )
+        else:
+            self._model = ParlerTTSForConditionalGeneration.from_pretrained(
+                self.model_name,
+                token=self.hf_token,
+                torch_dtype=torch_dtype,
+                # Fused scaled_dot_product_attention kernels instead of eager softmax(QK^T)V
+                attn_implementation="sdpa"
+            ).to(self.torch_device)
+            self._model = self._apply_dtype(self._model)
+        self._model.eval()
+        
+        if self.torch_device.type == "cpu" and self.dtype != "int8":
+            self._optimize_for_cpu(torch_dtype)
+        
+        if torch_dtype == torch.float32 and self.torch_device.type == "cuda":
+            # Older GPUs without bf16 still get tensor cores for fp32 matmuls
+            torch.backends.cuda.matmul.allow_tf32 = True
+        
+        if self.torch_device.type == "cuda":
+            if self.compile_model and quantization_config is None:
+                self._compile()
+            else:
+                # Populate the allocator's pool before the first request
+                self._warmup(rounds=1, max_new_tokens=8)
+
+    def _optimize_for_cpu(self, torch_dtype):
+        """
+        Apply Intel Extension for PyTorch's oneDNN kernels, if it is installed
+        
+        ipex.optimize prepacks Linear weights and fuses bias/activation
+        post-ops; with bf16 weights it uses AMX on CPUs that have it.
+        """
+        try:
+            import intel_extension_for_pytorch as ipex
+        except ImportError:
+            return
+        
+        try:
+            self._model = ipex.optimize(self._model, dtype=torch_dtype)
+            print("Optimized model for CPU with Intel Extension for PyTorch")
+        except Exception as e:
+            print(f"Intel Extension for PyTorch optimization skipped: {str(e)}")
+
+    def _quantization_config(self):
+        """bitsandbytes weight-only quantization config for int8/int4 on GPU, else None"""
+        if self.dtype == "int4" and self.torch_device.type != "cuda":
+            raise ValueError("int4 quantization requires a CUDA device")
+        if self.dtype not in ("int8", "int4") or self.torch_device.type != "cuda":
+            return None
+        
+        from transformers import BitsAndBytesConfig
+        
+        if self.dtype == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True)
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=torch.bfloat16,
+            bnb_4bit_quant_type="nf4"
+        )
+
+    def _compile(self):
+        """
+        Compile the model's forward pass for CUDA-graph decoding
+        
+        Follows parler-tts's inference guide: a static KV cache keeps decoder
+        shapes fixed so "reduce-overhead" can replay captured CUDA graphs, and
+        two warm-up generations pay the compile and graph capture here rather
+        than on the first request.
+        """
+        import importlib.util
+        
+        if importlib.util.find_spec("triton") is None:
+            print("Triton not available; skipping torch.compile")
+            return
+        
+        self._model.generation_config.cache_implementation = "static"
+        self._model.forward = torch.compile(self._model.forward, mode="reduce-overhead", fullgraph=False)
+        
+        print("Compiling Indic Parler TTS (first run takes a few minutes)...")
+        self._warmup(rounds=2, max_new_tokens=64)
+
+    def _warmup(self, rounds: int, max_new_tokens: int):
+        """Run short generations with the default description"""
+        inputs = self._tokenizer(self.default_description, return_tensors="pt").to(self.torch_device)
+        prompt = self._tokenizer("नमस्ते", return_tensors="pt").to(self.torch_device)
+        with torch.inference_mode():
+            for _ in range(rounds):
+                self._model.generate(
+                    input_ids=inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
+                    prompt_input_ids=prompt.input_ids,
+                    prompt_attention_mask=prompt.attention_mask,
+                    max_new_tokens=max_new_tokens,
+                )
+
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        self._tokenizer = None
+        self._desc_cache.clear()
+        super().unload()
+
+    def _description_inputs(self, description: str):
+        """Tokenized description as (input_ids, attention_mask) on the model's device"""
+        hit = self._desc_cache.get(description)
+        if hit is None:
+            tokens = self._tokenizer(description, return_tensors="pt", padding=True)
+            hit = self._desc_cache[description] = (
+                tokens.input_ids.to(self.torch_device),
+                tokens.attention_mask.to(self.torch_device),
+            )
+            if len(self._desc_cache) > self.DESCRIPTION_CACHE_SIZE:
+                self._desc_cache.popitem(last=False)
+        else:
+            self._desc_cache.move_to_end(description)
+        return hit
+
+    def _max_new_tokens(self, texts: List[str]) -> int:
+        """
+        Upper bound on decoding steps for the longest of texts
+        
+        Generation still stops at EOS; the bound only keeps a run that misses
+        EOS from decoding all the way to the model's max_length.
+        """
+        frame_rate = getattr(self._model.audio_encoder.config, "frame_rate", 86)
+        seconds = 1 + max(len(text) for text in texts) / self.MIN_CHARS_PER_SECOND
+        steps = int(seconds * frame_rate) + self._model.decoder.config.num_codebooks
+        steps = -(-steps // self.MAX_NEW_TOKENS_STEP) * self.MAX_NEW_TOKENS_STEP
+        return min(steps, self._model.generation_config.max_length)
+
+    def synthesize_raw(self, text: str, description: Optional[str] = None, **kwargs):
+        """
+        Synthesize speech and return (waveform, sample_rate) without writing a file
+        
+        Lets callers overlap the next generation with writing the previous clip.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        # Use provided description or default
+        voice_description = description or self.default_description
+        
+        # Tokenized description with attention mask, reused across calls
+        input_ids, attention_mask = self._description_inputs(voice_description)
+        
+        # Tokenize text prompt
+        prompt_tokens = self._tokenizer(
+            text, 
+            return_tensors="pt",
+            padding=True
+        )
+        prompt_input_ids = prompt_tokens.input_ids.to(self.torch_device)
+        if "max_new_tokens" not in kwargs and "max_length" not in kwargs:
+            kwargs["max_new_tokens"] = self._max_new_tokens([text])
+        
+        # Generate audio with attention mask for description
+        with torch.inference_mode():
+            generation = self._model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                prompt_input_ids=prompt_input_ids,
+                **kwargs
+            )
+        
+        # float() first: numpy has no bfloat16
+        return generation.cpu().float().numpy().squeeze(), self._model.config.sampling_rate
+
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None,
                    description: Optional[str] = None,
                    language: Optional[str] = None,
@@ -119,7 +347,8 @@ class IndicParlerTTS(TTSBase):
                         Use get_voice_descriptions() for examples.
             language: Language code (e.g., 'hi' for Hindi). Optional.
             use_default_output_dir: Use output/indic_parler/ folder structure
-            **kwargs: Additional generation parameters
+            **kwargs: Additional generation parameters; max_new_tokens defaults
+                      to a bound scaled from the text length
             
         Returns:
             Path to saved file if output_path provided, else audio bytes
@@ -128,58 +357,22 @@ class IndicParlerTTS(TTSBase):
             self.initialize()
         
         try:
-            # Prepare output path
-            if output_path is None:
-                output_path = "temp_output.wav"
-                return_bytes = True
-            else:
-                output_path = Path(output_path)
-                if use_default_output_dir and not output_path.is_absolute():
-                    output_path = Path("output") / "indic_parler" / output_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                return_bytes = False
-            
-            # Use provided description or default
-            voice_description = description or self.default_description
-            
-            # Tokenize description with attention mask
-            description_tokens = self._tokenizer(
-                voice_description, 
-                return_tensors="pt",
-                padding=True
-            )
-            input_ids = description_tokens.input_ids.to(self.torch_device)
-            attention_mask = description_tokens.attention_mask.to(self.torch_device)
-            
-            # Tokenize text prompt
-            prompt_tokens = self._tokenizer(
-                text, 
-                return_tensors="pt",
-                padding=True
-            )
-            prompt_input_ids = prompt_tokens.input_ids.to(self.torch_device)
+            audio_array, sample_rate = self.synthesize_raw(text, description=description, **kwargs)
             
-            # Generate audio with attention mask for description
-            generation = self._model.generate(
-                input_ids=input_ids,
-                attention_mask=attention_mask,
-                prompt_input_ids=prompt_input_ids,
-                **kwargs
-            )
+            if output_path is None:
+                # Encode in memory; no temp file round-trip
+                buffer = io.BytesIO()
+                write_pcm16(buffer, audio_array, sample_rate, format="WAV")
+                return buffer.getvalue()
             
-            # Get audio array and sample rate
-            audio_array = generation.cpu().numpy().squeeze()
-            sample_rate = self._model.config.sampling_rate
+            # Prepare output path
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "indic_parler" / output_path
+            self._ensure_dir(output_path.parent)
             
             # Save audio
-            sf.write(str(output_path), audio_array, sample_rate)
-            
-            if return_bytes:
-                with open(output_path, "rb") as f:
-                    audio_bytes = f.read()
-                os.remove(output_path)
-                return audio_bytes
-            
+            write_pcm16(str(output_path), audio_array, sample_rate)
             return str(output_path)
             
         except Exception as e:
@@ -197,8 +390,101 @@ class IndicParlerTTS(TTSBase):
         """Get example voice descriptions"""
         return self.VOICE_DESCRIPTIONS.copy()
     
+    def _generate_batch(self, texts: List[str], description: Optional[str] = None, **kwargs):
+        """
+        Generate several texts with one description in a single generate() call
+        
+        Returns (list of waveforms, sample_rate); each waveform is trimmed to
+        its own length using the audios_length Parler reports per row.
+        """
+        input_ids, attention_mask = self._description_inputs(description or self.default_description)
+        prompt_tokens = self._tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True
+        )
+        if "max_new_tokens" not in kwargs and "max_length" not in kwargs:
+            kwargs["max_new_tokens"] = self._max_new_tokens(texts)
+        
+        with torch.inference_mode():
+            generation = self._model.generate(
+                input_ids=input_ids.expand(len(texts), -1),
+                attention_mask=attention_mask.expand(len(texts), -1),
+                prompt_input_ids=prompt_tokens.input_ids.to(self.torch_device),
+                prompt_attention_mask=prompt_tokens.attention_mask.to(self.torch_device),
+                return_dict_in_generate=True,
+                **kwargs
+            )
+        
+        # float() first: numpy has no bfloat16
+        audio = generation.sequences.cpu().float().numpy()
+        lengths = generation.audios_length
+        waves = [audio[i, :int(lengths[i])] for i in range(len(texts))]
+        return waves, self._model.config.sampling_rate
+    
+    def _synthesize_to_paths(self, texts: List[str], output_paths: List[Path],
+                             description: Optional[str], batch_size: int, **kwargs) -> list:
+        """
+        Write texts[i] to output_paths[i], batch_size texts per generate() call
+        
+        Returns one entry per text: its path, or the Exception that text raised.
+        A batch that fails is retried one text at a time, so one bad text
+        does not fail the others.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        results = [None] * len(texts)
+        writes = []
+        
+        def write_one(writer, i):
+            try:
+                wave, sample_rate = self.synthesize_raw(texts[i], description=description, **kwargs)
+            except Exception as e:
+                results[i] = e
+                return
+            writes.append((i, writer.submit(write_pcm16, str(output_paths[i]), wave, sample_rate)))
+        
+        if batch_size <= 1:
+            # One generate() per text, with each file written in the
+            # background while the next text generates
+            with ThreadPoolExecutor(max_workers=2) as writer:
+                for i in range(len(texts)):
+                    write_one(writer, i)
+        else:
+            # Batching texts of similar token length keeps padding low and makes
+            # generate shapes repeat, so the allocator can reuse cached blocks
+            token_counts = [len(ids) for ids in self._tokenizer(texts).input_ids]
+            order = sorted(range(len(texts)), key=token_counts.__getitem__)
+            # Files are written on a worker thread while the next batch generates
+            with ThreadPoolExecutor(max_workers=min(4, batch_size)) as writer:
+                for start in range(0, len(order), batch_size):
+                    batch = order[start:start + batch_size]
+                    try:
+                        waves, sample_rate = self._generate_batch(
+                            [texts[i] for i in batch], description=description, **kwargs
+                        )
+                    except Exception as e:
+                        if len(batch) == 1:
+                            results[batch[0]] = e
+                            continue
+                        for i in batch:
+                            write_one(writer, i)
+                        continue
+                    for i, wave in zip(batch, waves):
+                        writes.append((i, writer.submit(write_pcm16, str(output_paths[i]), wave, sample_rate)))
+        
+        for i, write in writes:
+            try:
+                write.result()
+                results[i] = str(output_paths[i])
+            except Exception as e:
+                results[i] = e
+        return results
+    
     def synthesize_batch(self, texts: List[str], output_dir: Union[str, Path],
                         description: Optional[str] = None,
+                        batch_size: int = 4,
                         **kwargs) -> List[str]:
         """
         Synthesize multiple texts in batch
@@ -207,24 +493,33 @@ class IndicParlerTTS(TTSBase):
             texts: List of texts to synthesize
             output_dir: Directory to save output files
             description: Voice description (optional)
+            batch_size: Texts per generate() call (1 synthesizes one at a time)
             **kwargs: Additional parameters
             
         Returns:
             List of paths to generated audio files
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        output_paths = []
-        for i, text in enumerate(texts):
-            output_path = output_dir / f"output_{i+1:04d}.wav"
-            result = self.synthesize(
-                text=text,
-                output_path=output_path,
-                description=description,
-                use_default_output_dir=False,
-                **kwargs
-            )
-            output_paths.append(result)
-        
-        return output_paths
+        self._ensure_dir(output_dir)
+        output_paths = [output_dir / f"output_{i+1:04d}.wav" for i in range(len(texts))]
+        results = self._synthesize_to_paths(texts, output_paths, description, batch_size, **kwargs)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+    
+    def synthesize_many(self, texts: List[str], output_paths: List[Union[str, Path]],
+                        description: Optional[str] = None,
+                        language: Optional[str] = None,
+                        use_default_output_dir: bool = True,
+                        batch_size: int = 4,
+                        **kwargs) -> list:
+        """Synthesize texts that share a description to the given paths, in batches"""
+        paths = []
+        for output_path in output_paths:
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "indic_parler" / output_path
+            self._ensure_dir(output_path.parent)
+            paths.append(output_path)
+        return self._synthesize_to_paths(texts, paths, description, batch_size, **kwargs)
@@ -3,14 +3,25 @@ Kokoro TTS Implementation
 Text-to-speech with Hindi support using hexgrad/kokoro
 """
 
+import io
 import os
+import numpy as np
 import soundfile as sf
+import torch
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import Iterator, Optional, Union, List
 
+from tts_playground.audio import pcm16_bytes, wav_stream_header, write_pcm16
 from tts_playground.base import TTSBase
 
 
+# Loaded pipelines by (model_name, device, dtype); entries drop out once no
+# engine instance holds the pipeline
+_PIPELINE_CACHE = weakref.WeakValueDictionary()
+
+
 class KokoroTTS(TTSBase):
     """
     Kokoro TTS Engine
@@ -34,8 +45,14 @@ class KokoroTTS(TTSBase):
         "hi": "Hindi",
     }
     
+    SAMPLE_RATE = 24000  # Kokoro default sample rate
+    
+    # Voice packs are float32, so only int8 dynamic quantization is supported
+    SUPPORTED_DTYPES = ("fp32", "int8")
+    
     def __init__(self, model_name: str = "hexgrad/Kokoro-82M",
-                 device: str = "cpu", voice: str = "hf_alpha"):
+                 device: str = "cpu", voice: str = "hf_alpha",
+                 dtype: Optional[str] = None):
         """
         Initialize Kokoro TTS engine
         
@@ -43,8 +60,9 @@ class KokoroTTS(TTSBase):
             model_name: HuggingFace model name
             device: Device to run on ('cpu' or 'cuda')
             voice: Voice ID to use (default: hf_alpha for Hindi female)
+            dtype: Weight precision ('fp32' or 'int8'), None for default
         """
-        super().__init__(model_name, device)
+        super().__init__(model_name, device, dtype)
         self.voice = voice
         self._pipeline = None
 
@@ -60,9 +78,18 @@ class KokoroTTS(TTSBase):
             
             from kokoro import KPipeline
             
-            # Initialize pipeline with Hindi language
-            # lang_code 'h' is for Hindi in Kokoro
-            self._pipeline = KPipeline(lang_code='h', device=self.device)
+            # Engines with the same settings share one pipeline and its weights
+            key = (self.model_name, self.device, self.dtype)
+            self._pipeline = _PIPELINE_CACHE.get(key)
+            if self._pipeline is None:
+                # Initialize pipeline with Hindi language
+                # lang_code 'h' is for Hindi in Kokoro
+                self._pipeline = KPipeline(lang_code='h', device=self.device)
+                self._pipeline.model = self._apply_dtype(self._pipeline.model)
+                self._pipeline.model.eval()
+                if self.device != "cpu" and os.getenv("KOKORO_COMPILE") == "1":
+                    self._compile_decoder()
+                _PIPELINE_CACHE[key] = self._pipeline
             
             self._initialized = True
             print("Kokoro TTS model loaded successfully!")
@@ -70,6 +97,78 @@ class KokoroTTS(TTSBase):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Kokoro TTS: {str(e)}")
 
+    def _compile_decoder(self):
+        """
+        Compile the waveform decoder, which issues most of the model's kernels
+        
+        Each chunk has its own length, so CUDA graphs (fixed shapes) would be
+        re-captured for nearly every chunk; dynamic=True instead keeps one
+        fused graph for all lengths, cutting the launch count per chunk.
+        """
+        import torch._inductor.config
+        
+        torch._inductor.config.fx_graph_cache = True
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.expanduser("~/.cache/kokoro_inductor"))
+        model = self._pipeline.model
+        model.decoder = torch.compile(model.decoder, dynamic=True, fullgraph=False)
+        print("Compiled Kokoro decoder with torch.compile")
+
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        self._pipeline = None
+        super().unload()
+
+    def synthesize_raw(self, text: str, voice: Optional[str] = None,
+                       speed: float = 1.0, **kwargs):
+        """
+        Synthesize speech and return (waveform, sample_rate) without writing a file
+        
+        Lets callers overlap the next generation with writing the previous clip.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        # Use provided voice or default
+        voice_id = voice or self.voice
+        
+        # Generate audio using Kokoro pipeline
+        # The pipeline returns a generator of (graphemes, phonemes, audio) tuples
+        with torch.inference_mode():
+            audio_chunks = [audio for _, _, audio in self._pipeline(text, voice=voice_id, speed=speed)
+                            if audio is not None]
+        if not audio_chunks:
+            raise RuntimeError("No audio generated")
+        
+        # Concatenate all audio chunks
+        return np.concatenate(audio_chunks), self.SAMPLE_RATE
+
+    def _write_stream(self, file, text: str, voice: Optional[str] = None,
+                      speed: float = 1.0, **kwargs):
+        """
+        Write each pipeline chunk to file as it is produced
+        
+        Avoids holding every chunk and then a concatenated copy in memory.
+        file may be a path or a binary file object (pass format= for the latter).
+        The file is opened on the first chunk, so nothing is created if the
+        pipeline produces no audio.
+        """
+        voice_id = voice or self.voice
+        f = None
+        try:
+            with torch.inference_mode():
+                for _, _, audio in self._pipeline(text, voice=voice_id, speed=speed):
+                    if audio is None:
+                        continue
+                    if f is None:
+                        f = sf.SoundFile(file, mode="w", samplerate=self.SAMPLE_RATE,
+                                         channels=1, subtype="PCM_16", **kwargs)
+                    f.buffer_write(pcm16_bytes(audio), dtype="int16")
+        finally:
+            if f is not None:
+                f.close()
+        if f is None:
+            raise RuntimeError("No audio generated")
+
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None,
                    voice: Optional[str] = None,
                    speed: float = 1.0,
@@ -93,49 +192,57 @@ class KokoroTTS(TTSBase):
             self.initialize()
         
         try:
-            # Prepare output path
             if output_path is None:
-                output_path = "temp_output.wav"
-                return_bytes = True
-            else:
-                output_path = Path(output_path)
-                if use_default_output_dir and not output_path.is_absolute():
-                    output_path = Path("output") / "kokoro" / output_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                return_bytes = False
-            
-            # Use provided voice or default
-            voice_id = voice or self.voice
-            
-            # Generate audio using Kokoro pipeline
-            # The pipeline returns a generator of (graphemes, phonemes, audio) tuples
-            audio_chunks = []
-            sample_rate = 24000  # Kokoro default sample rate
+                # Encode in memory; no temp file round-trip
+                buffer = io.BytesIO()
+                self._write_stream(buffer, text, voice=voice, speed=speed, format="WAV")
+                return buffer.getvalue()
             
-            for _, _, audio in self._pipeline(text, voice=voice_id, speed=speed):
-                audio_chunks.append(audio)
-            
-            # Concatenate all audio chunks
-            import numpy as np
-            if audio_chunks:
-                full_audio = np.concatenate(audio_chunks)
-            else:
-                raise RuntimeError("No audio generated")
-            
-            # Save audio
-            sf.write(str(output_path), full_audio, sample_rate)
-            
-            if return_bytes:
-                with open(output_path, "rb") as f:
-                    audio_bytes = f.read()
-                os.remove(output_path)
-                return audio_bytes
+            # Prepare output path
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "kokoro" / output_path
+            self._ensure_dir(output_path.parent)
             
+            # Save audio chunk by chunk as the pipeline yields it
+            self._write_stream(str(output_path), text, voice=voice, speed=speed)
             return str(output_path)
             
         except Exception as e:
             raise RuntimeError(f"Failed to synthesize speech: {str(e)}")
 
+    def stream_synthesize(self, text: str, voice: Optional[str] = None,
+                          speed: float = 1.0, **kwargs) -> Iterator[bytes]:
+        """
+        Synthesize speech and yield it as a streaming WAV
+        
+        Yields a WAV header first, then 16-bit PCM frames for each chunk as
+        the pipeline produces it, so playback can start before the whole
+        text is synthesized.
+        
+        Args:
+            text: Text to convert to speech (Hindi text supported)
+            voice: Voice ID override (default uses instance voice)
+            speed: Speech speed multiplier (default 1.0)
+            **kwargs: Ignored (accepted for interface compatibility)
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        voice_id = voice or self.voice
+        yield wav_stream_header(self.SAMPLE_RATE)
+        chunks = self._pipeline(text, voice=voice_id, speed=speed)
+        while True:
+            # Grad mode is thread-local, so inference mode is entered per chunk
+            # rather than held across yields into the caller's code
+            with torch.inference_mode():
+                result = next(chunks, None)
+            if result is None:
+                break
+            _, _, audio = result
+            if audio is not None:
+                yield pcm16_bytes(audio)
+
     def get_supported_languages(self) -> list:
         """Get list of supported language codes"""
         return list(self.SUPPORTED_LANGUAGES.keys())
@@ -166,19 +273,19 @@ class KokoroTTS(TTSBase):
             List of paths to generated audio files
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(output_dir)
         
+        # soundfile releases the GIL while encoding, so each file is written
+        # in the background while the next text is synthesized
         output_paths = []
-        for i, text in enumerate(texts):
-            output_path = output_dir / f"output_{i+1:04d}.wav"
-            result = self.synthesize(
-                text=text,
-                output_path=output_path,
-                voice=voice,
-                speed=speed,
-                use_default_output_dir=False,
-                **kwargs
-            )
-            output_paths.append(result)
+        with ThreadPoolExecutor(max_workers=2) as writer:
+            writes = []
+            for i, text in enumerate(texts):
+                output_path = output_dir / f"output_{i+1:04d}.wav"
+                audio, sample_rate = self.synthesize_raw(text, voice=voice, speed=speed)
+                writes.append(writer.submit(write_pcm16, str(output_path), audio, sample_rate))
+                output_paths.append(str(output_path))
+            for write in writes:
+                write.result()
         
         return output_paths
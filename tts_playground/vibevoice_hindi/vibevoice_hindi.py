@@ -4,14 +4,24 @@ High-quality Hindi TTS with voice cloning and multi-speaker support
 Model: tarun7r/vibevoice-hindi-1.5B
 """
 
+import io
 import os
-import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Union, List, Dict
 
+from tts_playground.audio import write_pcm16
 from tts_playground.base import TTSBase
 
 
+# torch.cuda.empty_cache() walks the whole caching allocator and makes the
+# next calls cudaMalloc again, while freeing nothing that is still in use, so
+# it is never called per synthesis; set VIBEVOICE_EMPTY_CACHE=1 to release
+# cached blocks once a synthesize_batch() finishes (e.g. to share the GPU)
+_EMPTY_CACHE = os.environ.get("VIBEVOICE_EMPTY_CACHE") == "1"
+
+
 class VibeVoiceHindiTTS(TTSBase):
     """
     VibeVoice Hindi TTS Engine
@@ -32,14 +42,51 @@ class VibeVoiceHindiTTS(TTSBase):
     
     DEFAULT_SPEAKER = "hi-Priya_woman"
     
+    # On GPU, int8 is torchao weight-only and int4 (GPU only) bitsandbytes NF4,
+    # both applied to the language model alone
+    SUPPORTED_DTYPES = ("fp32", "fp16", "bf16", "int8", "int4")
+    GPU_INT8 = True
+    
+    # Number of decoded reference voices kept in memory (~1 MB per 10 s clip)
+    VOICE_CACHE_SIZE = 16
+    
+    # Audio modules kept at full precision when the language model is quantized
+    _UNQUANTIZED_MODULES = [
+        "acoustic_tokenizer", "semantic_tokenizer",
+        "acoustic_connector", "semantic_connector",
+        "prediction_head", "lm_head",
+    ]
+    
     def __init__(self, model_name: str = "tarun7r/vibevoice-hindi-1.5B",
-                 device: str = "cuda"):
-        super().__init__(model_name, device)
+                 device: str = "cuda", dtype: Optional[str] = None,
+                 compile_mode: Optional[str] = None):
+        """
+        Initialize VibeVoice Hindi TTS engine
+        
+        Args:
+            model_name: HuggingFace model name
+            device: Device to run on ('cuda' or 'cpu')
+            dtype: Weight precision ('fp32', 'fp16', 'bf16', 'int8' (int8 weight-only
+                   language model on GPU) or 'int4' (GPU only, NF4 language
+                   model)), None for default
+            compile_mode: On CUDA, torch.compile mode for the model (e.g.
+                          'reduce-overhead'); defaults to $VIBEVOICE_COMPILE, unset
+                          to stay in eager mode
+        """
+        super().__init__(model_name, device, dtype)
+        self.compile_mode = compile_mode or os.getenv("VIBEVOICE_COMPILE") or None
         self._model = None
         self._processor = None
         self._voices_dir = None
         self._default_speaker_wav = None
         self._sample_rate = 24000
+        
+        # Decoded, resampled reference waveforms keyed by file identity
+        self._voice_cache = OrderedDict()
+        
+        # generate() runs under torch.inference_mode unless a compiled model
+        # turns out not to support it
+        self._inference_mode = True
 
     def initialize(self):
         """Initialize the VibeVoice Hindi TTS model"""
@@ -57,17 +104,55 @@ class VibeVoiceHindiTTS(TTSBase):
             
             # Load model
             print("Loading model...")
-            dtype = torch.float16 if self.device == "cuda" else torch.float32
-            
-            self._model = VibeVoiceForConditionalGenerationInference.from_pretrained(
-                self.model_name,
-                torch_dtype=dtype,
-            )
-            
+            dtype = torch.float32
             if self.device == "cuda":
-                self._model = self._model.to(self.device)
+                # bf16 on Ampere and newer: same speed as fp16 there, with
+                # fp32's range, so the diffusion head's sums cannot overflow
+                bf16 = torch.cuda.get_device_capability()[0] >= 8
+                dtype = torch.bfloat16 if bf16 else torch.float16
+                if self.dtype is None:
+                    self.dtype = "bf16" if bf16 else "fp16"
+            if self.dtype in ("fp32", "fp16", "bf16"):
+                dtype = {"fp32": torch.float32, "fp16": torch.float16,
+                         "bf16": torch.bfloat16}[self.dtype]
+            
+            quantization_config = self._quantization_config(dtype)
+            if quantization_config is not None:
+                # bitsandbytes places the quantized weights on the GPU itself
+                self._model = VibeVoiceForConditionalGenerationInference.from_pretrained(
+                    self.model_name,
+                    torch_dtype=dtype,
+                    quantization_config=quantization_config,
+                    attn_implementation="sdpa",
+                    device_map={"": self.device},
+                )
+            else:
+                attn_implementation = self._attn_implementation(dtype)
+                try:
+                    self._model = VibeVoiceForConditionalGenerationInference.from_pretrained(
+                        self.model_name,
+                        torch_dtype=dtype,
+                        attn_implementation=attn_implementation,
+                    )
+                except (ImportError, ValueError):
+                    if attn_implementation == "sdpa":
+                        raise
+                    print(f"{attn_implementation} unavailable, using sdpa")
+                    self._model = VibeVoiceForConditionalGenerationInference.from_pretrained(
+                        self.model_name,
+                        torch_dtype=dtype,
+                        attn_implementation="sdpa",
+                    )
+                
+                if self.device == "cuda":
+                    self._model = self._model.to(self.device)
             
             self._model.eval()
+            if self.dtype == "int8":
+                if self.device == "cuda":
+                    self._quantize_int8_weight_only()
+                else:
+                    self._model = self._apply_dtype(self._model)
             
             # Load processor
             print("Loading processor...")
@@ -114,14 +199,254 @@ class VibeVoiceHindiTTS(TTSBase):
                     print(f"Using user voice file: {ref}")
                     break
             
+            # Set before compiling because the warm-up calls synthesize(),
+            # and cleared below if compilation or warm-up fails
             self._initialized = True
+            
+            if self.compile_mode and self.device == "cuda":
+                self._compile()
+            
             print("VibeVoice Hindi TTS model loaded successfully!")
             
         except Exception as e:
+            self._initialized = False
             import traceback
             traceback.print_exc()
             raise RuntimeError(f"Failed to initialize VibeVoice Hindi TTS: {str(e)}")
 
+    def _attn_implementation(self, dtype) -> str:
+        """FlashAttention-2 for half precision on CUDA when flash-attn is installed, else SDPA"""
+        import importlib.util
+        import torch
+        
+        if (self.device == "cuda" and dtype in (torch.float16, torch.bfloat16)
+                and importlib.util.find_spec("flash_attn") is not None):
+            return "flash_attention_2"
+        return "sdpa"
+
+    def _quantization_config(self, compute_dtype):
+        """bitsandbytes NF4 config for the language model when dtype is int4, else None"""
+        if self.dtype != "int4":
+            return None
+        if self.device != "cuda":
+            raise ValueError("int4 quantization requires a CUDA device")
+        
+        from transformers import BitsAndBytesConfig
+        
+        # The diffusion head and audio tokenizers are small and sensitive to
+        # precision, so only the language model's Linear layers are quantized
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=compute_dtype,
+            llm_int8_skip_modules=self._UNQUANTIZED_MODULES,
+        )
+
+    def _quantize_int8_weight_only(self):
+        """
+        Store the language model's Linear weights as int8 (torchao)
+        
+        Decoding is bound by reading LLM weights each step, so halving their
+        size speeds it up; activations and the audio modules stay in half
+        precision. Runs before any torch.compile so the compiled graphs
+        include the int8 kernels.
+        """
+        try:
+            from torchao.quantization import int8_weight_only, quantize_
+        except ImportError:
+            raise RuntimeError("int8 on CUDA requires torchao (pip install torchao)")
+        
+        quantize_(self._model.model.language_model, int8_weight_only())
+
+    def _compile(self):
+        """
+        Compile the model's repeated regions and warm them up
+        
+        Each decoder layer of the language model and the diffusion head are
+        compiled on their own (regional compilation): identical layers share
+        one compiled graph, and generate()'s sampling and KV-cache code stays
+        eager, so it cannot break the graphs. Falls back to compiling the
+        whole forward if the layout is not recognized.
+        
+        'reduce-overhead' replays CUDA graphs, which need fixed shapes, so it
+        also tries a static KV cache (see _try_static_cache). Two short
+        warm-up syntheses pay the compile and graph capture here instead of on
+        the first request.
+        """
+        import torch
+        
+        cuda_graphs = self.compile_mode == "reduce-overhead"
+        # Captured graphs are per shape, so decode shapes stay static for
+        # them; otherwise one dynamic graph covers every sequence length
+        dynamic = None if cuda_graphs else True
+        
+        inner = getattr(self._model, "model", None)
+        layers = getattr(getattr(inner, "language_model", None), "layers", None)
+        head = getattr(inner, "prediction_head", None)
+        if layers is not None:
+            for layer in layers:
+                layer.compile(mode=self.compile_mode, dynamic=dynamic)
+            if head is not None:
+                head.compile(mode=self.compile_mode, dynamic=dynamic)
+        else:
+            self._model.forward = torch.compile(self._model.forward, mode=self.compile_mode, fullgraph=False)
+        if not self._default_speaker_wav:
+            return
+        print("Compiling VibeVoice (first run takes a few minutes)...")
+        if cuda_graphs:
+            self._try_static_cache()
+        for _ in range(2):
+            self.synthesize("नमस्ते")
+
+    def _try_static_cache(self):
+        """
+        Switch generation to a static KV cache if a warm-up generate accepts it
+        
+        VibeVoice's generate() builds and edits its own caches for the
+        positive and negative CFG passes, which a StaticCache may not
+        support, so the setting is only kept when a synthesis with it
+        succeeds; otherwise the dynamic cache is restored.
+        """
+        config = self._model.generation_config
+        previous = getattr(config, "cache_implementation", None)
+        config.cache_implementation = "static"
+        try:
+            self.synthesize("नमस्ते")
+        except Exception as e:
+            config.cache_implementation = previous
+            print(f"Static KV cache not supported, keeping the dynamic cache: {str(e)}")
+
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        self._processor = None
+        self._voice_cache.clear()
+        super().unload()
+
+    def _load_voice(self, voice_file: Union[str, Path]):
+        """
+        Return the reference voice as a waveform at the processor's rate
+        
+        Reading and resampling the clip is cached by (path, size, mtime), so
+        repeat calls with the same voice hand the processor an array instead
+        of a path. Falls back to the path if the processor cannot load audio.
+        """
+        load = getattr(getattr(self._processor, "audio_processor", None), "_load_audio_from_path", None)
+        if load is None:
+            return str(voice_file)
+        
+        path = Path(voice_file).resolve()
+        st = path.stat()
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        wav = self._voice_cache.get(key)
+        if wav is None:
+            wav = self._voice_cache[key] = load(str(path))
+            if len(self._voice_cache) > self.VOICE_CACHE_SIZE:
+                self._voice_cache.popitem(last=False)
+        else:
+            self._voice_cache.move_to_end(key)
+        return wav
+
+    def _resolve_voice(self, speaker: Optional[str] = None,
+                       speaker_wav: Optional[Union[str, Path]] = None) -> str:
+        """Pick the reference voice file for cloning - REQUIRED for VibeVoice"""
+        voice_file = speaker_wav
+        if not voice_file and speaker:
+            # Check for speaker-specific voice file
+            voice_path = self._voices_dir / f"{speaker}.wav"
+            if voice_path.exists():
+                voice_file = str(voice_path)
+        if not voice_file:
+            voice_file = self._default_speaker_wav
+        
+        if not voice_file or not Path(voice_file).exists():
+            raise ValueError(
+                "VibeVoice requires a reference voice file. "
+                "Provide speaker_wav parameter or ensure voice files are downloaded."
+            )
+        return voice_file
+
+    @staticmethod
+    def _to_waveform(audio):
+        """Convert one generated clip to a mono float32 numpy array in [-1, 1]"""
+        import numpy as np
+        import torch
+        
+        # Convert to numpy float32 (soundfile doesn't support float16)
+        if torch.is_tensor(audio):
+            audio = audio.cpu().float().numpy()
+        
+        # Mono output comes back as (1, ..., samples); flatten it as a
+        # view rather than a copy
+        if audio.ndim > 1 and audio.size == audio.shape[-1]:
+            audio = audio.reshape(-1)
+        
+        # Convert to float32 if needed (no copy when it already is)
+        audio = audio.astype(np.float32, copy=False)
+        
+        # Normalize if needed, in place; peak from max/min avoids
+        # materializing np.abs(audio)
+        max_val = max(audio.max(), -audio.min())
+        if max_val > 1.0:
+            audio /= max_val
+        return audio
+
+    def _generate(self, texts: List[str], voice_file: str, cfg_scale: float = 1.3,
+                  **kwargs) -> list:
+        """
+        Generate texts with one reference voice in a single generate() call
+        
+        Returns one waveform per text. The processor pads the scripts into a
+        batch and the voice is decoded once (see _load_voice).
+        """
+        import torch
+        
+        voice = self._load_voice(voice_file)
+        # VibeVoice expects format: "Speaker 1: text" (regex: ^Speaker\s+(\d+)\s*:\s*(.*)$)
+        inputs = self._processor(
+            text=[f"Speaker 1: {text}" for text in texts],
+            voice_samples=[[voice] for _ in texts],
+            padding=True,
+            return_attention_mask=True,
+            return_tensors="pt"
+        )
+        
+        if self.device == "cuda":
+            inputs = {k: v.to(self.device) if torch.is_tensor(v) else v 
+                      for k, v in inputs.items()}
+        
+        # Generate audio - need to pass tokenizer from processor
+        generate_kwargs = dict(inputs, tokenizer=self._processor.tokenizer,
+                               guidance_scale=cfg_scale, **kwargs)
+        try:
+            with (torch.inference_mode() if self._inference_mode else torch.no_grad()):
+                outputs = self._model.generate(**generate_kwargs)
+        except RuntimeError as e:
+            # Compiled regions can reject inference tensors; no_grad still
+            # skips autograd, so drop to it for the rest of the session
+            if not (self.compile_mode and self._inference_mode):
+                raise
+            print(f"inference_mode failed with compiled model, using no_grad: {str(e)}")
+            self._inference_mode = False
+            with torch.no_grad():
+                outputs = self._model.generate(**generate_kwargs)
+        
+        # Extract audio from VibeVoiceGenerationOutput
+        speech_outputs = getattr(outputs, "speech_outputs", None)
+        if speech_outputs:
+            audios = list(speech_outputs)
+        elif hasattr(outputs, 'audio'):
+            audios = [outputs.audio]
+        elif hasattr(outputs, 'waveform'):
+            audios = [outputs.waveform]
+        elif isinstance(outputs, tuple):
+            audios = [outputs[0]]
+        else:
+            audios = [outputs]
+        
+        if len(audios) != len(texts) or any(audio is None for audio in audios):
+            raise RuntimeError("No audio generated")
+        return [self._to_waveform(audio) for audio in audios]
+
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None,
                    speaker: Optional[str] = None,
                    speaker_wav: Optional[Union[str, Path]] = None,
@@ -145,102 +470,24 @@ class VibeVoiceHindiTTS(TTSBase):
             self.initialize()
         
         try:
-            import torch
-            import soundfile as sf
-            import numpy as np
+            self._seed(seed)
+            voice_file = self._resolve_voice(speaker, speaker_wav)
+            audio = self._generate([text], voice_file, cfg_scale=cfg_scale, **kwargs)[0]
             
-            # Prepare output path
             if output_path is None:
-                output_path = tempfile.mktemp(suffix=".wav")
-                return_bytes = True
-            else:
-                output_path = Path(output_path)
-                if use_default_output_dir and not output_path.is_absolute():
-                    output_path = Path("output") / "vibevoice_hindi" / output_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                return_bytes = False
-            
-            if seed is not None:
-                torch.manual_seed(seed)
-                np.random.seed(seed)
-            
-            # Determine voice file for cloning - REQUIRED for VibeVoice
-            voice_file = speaker_wav
-            if not voice_file and speaker:
-                # Check for speaker-specific voice file
-                voice_path = self._voices_dir / f"{speaker}.wav"
-                if voice_path.exists():
-                    voice_file = str(voice_path)
-            if not voice_file:
-                voice_file = self._default_speaker_wav
-            
-            if not voice_file or not Path(voice_file).exists():
-                raise ValueError(
-                    "VibeVoice requires a reference voice file. "
-                    "Provide speaker_wav parameter or ensure voice files are downloaded."
-                )
+                # Encode in memory; no temp file round-trip
+                buffer = io.BytesIO()
+                write_pcm16(buffer, audio, self._sample_rate, format="WAV")
+                return buffer.getvalue()
             
-            # Process inputs
-            with torch.no_grad():
-                # VibeVoice expects format: "Speaker 1: text" (regex: ^Speaker\s+(\d+)\s*:\s*(.*)$)
-                formatted_text = f"Speaker 1: {text}"
-                
-                # Use processor to prepare inputs with voice samples
-                inputs = self._processor(
-                    text=formatted_text,
-                    voice_samples=[voice_file],
-                    return_tensors="pt"
-                )
-                
-                if self.device == "cuda":
-                    inputs = {k: v.to(self.device) if torch.is_tensor(v) else v 
-                              for k, v in inputs.items()}
-                
-                # Generate audio - need to pass tokenizer from processor
-                outputs = self._model.generate(
-                    **inputs,
-                    tokenizer=self._processor.tokenizer,
-                    guidance_scale=cfg_scale,
-                    **kwargs
-                )
-                
-                # Extract audio from VibeVoiceGenerationOutput
-                if hasattr(outputs, 'speech_outputs') and outputs.speech_outputs:
-                    audio = outputs.speech_outputs[0]
-                elif hasattr(outputs, 'audio'):
-                    audio = outputs.audio
-                elif hasattr(outputs, 'waveform'):
-                    audio = outputs.waveform
-                elif isinstance(outputs, tuple):
-                    audio = outputs[0]
-                else:
-                    audio = outputs
-                
-                # Convert to numpy float32 (soundfile doesn't support float16)
-                if torch.is_tensor(audio):
-                    audio = audio.cpu().numpy()
-                
-                # Squeeze extra dimensions
-                while len(audio.shape) > 1 and audio.shape[0] == 1:
-                    audio = audio.squeeze(0)
-                
-                # Convert to float32 if needed
-                audio = audio.astype(np.float32)
-                
-                # Normalize if needed
-                max_val = np.abs(audio).max()
-                if max_val > 1.0:
-                    audio = audio / max_val
+            # Prepare output path
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "vibevoice_hindi" / output_path
+            self._ensure_dir(output_path.parent)
             
             # Save audio
-            sf.write(str(output_path), audio, self._sample_rate)
-            
-            if return_bytes:
-                with open(output_path, "rb") as f:
-                    audio_bytes = f.read()
-                os.remove(output_path)
-                return audio_bytes
-            
+            write_pcm16(str(output_path), audio, self._sample_rate)
             return str(output_path)
             
         except Exception as e:
@@ -248,6 +495,16 @@ class VibeVoiceHindiTTS(TTSBase):
             traceback.print_exc()
             raise RuntimeError(f"Failed to synthesize speech: {str(e)}")
 
+    @staticmethod
+    def _seed(seed: Optional[int]):
+        """Seed torch and numpy so sampling is reproducible"""
+        if seed is not None:
+            import numpy as np
+            import torch
+            
+            torch.manual_seed(seed)
+            np.random.seed(seed)
+
     def synthesize_with_voice(self, text: str, speaker_wav: Union[str, Path],
                               output_path: Optional[Union[str, Path]] = None,
                               **kwargs) -> Union[bytes, str]:
@@ -264,15 +521,113 @@ class VibeVoiceHindiTTS(TTSBase):
     def get_language_names(self) -> dict:
         return {"hi": "Hindi"}
 
+    @staticmethod
+    def _maybe_empty_cache():
+        """Release cached CUDA blocks if VIBEVOICE_EMPTY_CACHE=1"""
+        if not _EMPTY_CACHE:
+            return
+        import torch
+        
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _synthesize_to_paths(self, texts: List[str], output_paths: List[Path],
+                             speaker: Optional[str], speaker_wav: Optional[Union[str, Path]],
+                             cfg_scale: float, seed: Optional[int], batch_size: int,
+                             **kwargs) -> list:
+        """
+        Write texts[i] to output_paths[i], batch_size texts per generate() call
+        
+        Returns one entry per text: its path, or the Exception that text raised.
+        A batch that fails is retried one text at a time, so one bad text
+        does not fail the others.
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        self._seed(seed)
+        try:
+            voice_file = self._resolve_voice(speaker, speaker_wav)
+        except Exception as e:
+            # Every text shares the voice, so they all fail with it
+            return [e] * len(texts)
+        
+        results = [None] * len(texts)
+        writes = []
+        
+        def generate(writer, batch):
+            waves = self._generate([texts[i] for i in batch], voice_file,
+                                   cfg_scale=cfg_scale, **kwargs)
+            for i, wave in zip(batch, waves):
+                writes.append((i, writer.submit(
+                    write_pcm16, str(output_paths[i]), wave, self._sample_rate
+                )))
+        
+        # Similar lengths batch together so little of each batch is padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batch_size = max(1, batch_size)
+        with ThreadPoolExecutor(max_workers=min(4, batch_size)) as writer:
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                try:
+                    generate(writer, batch)
+                except Exception as e:
+                    if len(batch) == 1:
+                        results[batch[0]] = e
+                        continue
+                    for i in batch:
+                        try:
+                            generate(writer, [i])
+                        except Exception as e:
+                            results[i] = e
+        
+        for i, write in writes:
+            try:
+                write.result()
+                results[i] = str(output_paths[i])
+            except Exception as e:
+                results[i] = e
+        self._maybe_empty_cache()
+        return results
+
     def synthesize_batch(self, texts: List[str], output_dir: Union[str, Path],
+                        speaker: Optional[str] = None,
+                        speaker_wav: Optional[Union[str, Path]] = None,
+                        cfg_scale: float = 1.3,
+                        seed: Optional[int] = None,
+                        batch_size: int = 4,
                         **kwargs) -> List[str]:
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        """
+        Synthesize multiple texts with one voice, batch_size texts per generate() call
         
+        Returns:
+            List of paths to generated audio files
+        """
+        output_dir = Path(output_dir)
+        self._ensure_dir(output_dir)
+        output_paths = [output_dir / f"output_{i+1:04d}.wav" for i in range(len(texts))]
+        results = self._synthesize_to_paths(texts, output_paths, speaker, speaker_wav,
+                                            cfg_scale, seed, batch_size, **kwargs)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def synthesize_many(self, texts: List[str], output_paths: List[Union[str, Path]],
+                        speaker: Optional[str] = None,
+                        speaker_wav: Optional[Union[str, Path]] = None,
+                        use_default_output_dir: bool = True,
+                        cfg_scale: float = 1.3,
+                        seed: Optional[int] = None,
+                        batch_size: int = 4,
+                        **kwargs) -> list:
+        """Synthesize texts that share a voice to the given paths, in batches"""
         paths = []
-        for i, text in enumerate(texts):
-            path = output_dir / f"output_{i+1:04d}.wav"
-            result = self.synthesize(text=text, output_path=path, 
-                                     use_default_output_dir=False, **kwargs)
-            paths.append(result)
-        return paths
+        for output_path in output_paths:
+            output_path = Path(output_path)
+            if use_default_output_dir and not output_path.is_absolute():
+                output_path = Path("output") / "vibevoice_hindi" / output_path
+            self._ensure_dir(output_path.parent)
+            paths.append(output_path)
+        return self._synthesize_to_paths(texts, paths, speaker, speaker_wav,
+                                         cfg_scale, seed, batch_size, **kwargs)
@@ -5,6 +5,8 @@ A CPU-optimized implementation for Hindi text-to-speech
 
 import os
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Union
 
@@ -114,8 +116,15 @@ class XTTSHindi(TTSBase):
     Optimized for CPU usage
     """
     
+    # Half precision breaks the float32 conditioning inputs; int8 keeps them
+    SUPPORTED_DTYPES = ("fp32", "int8")
+    
+    # Number of distinct speaker references whose latents are kept
+    LATENT_CACHE_SIZE = 16
+    
     def __init__(self, model_name: str = "Abhinay45/XTTS-Hindi-finetuned", 
-                 device: str = "cpu", hf_token: Optional[str] = None):
+                 device: str = "cpu", hf_token: Optional[str] = None,
+                 dtype: Optional[str] = None):
         """
         Initialize XTTS-Hindi TTS engine
         
@@ -123,8 +132,9 @@ class XTTSHindi(TTSBase):
             model_name: HuggingFace model name
             device: Device to run on ('cpu' or 'cuda')
             hf_token: HuggingFace token (if None, reads from HF_TOKEN env var)
+            dtype: Weight precision ('fp32' or 'int8'), None for default
         """
-        super().__init__(model_name, device)
+        super().__init__(model_name, device, dtype)
         self.hf_token = hf_token or os.getenv("HF_TOKEN")
         if not self.hf_token:
             raise ValueError(
@@ -141,6 +151,11 @@ class XTTSHindi(TTSBase):
         # Store model directory path for finding default speaker files
         self._model_dir = None
         self._default_speaker_wav = None
+        
+        # Speaker conditioning latents keyed by reference file version and settings
+        self._latent_cache = OrderedDict()
+        # The API runs syntheses on a thread pool, so cache updates are locked
+        self._latent_lock = threading.Lock()
     
     def initialize(self):
         """Initialize the XTTS-Hindi model"""
@@ -294,6 +309,9 @@ class XTTSHindi(TTSBase):
                 init_kwargs["config_path"] = config_path
             
             self._model = TTS(**init_kwargs)
+            synthesizer = self._model.synthesizer
+            synthesizer.tts_model = self._apply_dtype(synthesizer.tts_model)
+            self._cache_conditioning_latents(synthesizer.tts_model)
             
             self._initialized = True
             print("XTTS-Hindi model loaded successfully!")
@@ -301,6 +319,50 @@ class XTTSHindi(TTSBase):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize XTTS-Hindi model: {str(e)}")
     
+    def _cache_conditioning_latents(self, tts_model):
+        """
+        Memoize the model's reference-audio encoder
+        
+        XTTS re-encodes speaker_wav on every call. Results are keyed by each
+        reference file's path, size and mtime plus the encoder settings, so an
+        edited file is re-encoded.
+        """
+        compute = getattr(tts_model, "get_conditioning_latents", None)
+        if compute is None:
+            return
+        cache = self._latent_cache
+        lock = self._latent_lock
+        
+        def cached(audio_path, *args, **kwargs):
+            paths = audio_path if isinstance(audio_path, (list, tuple)) else [audio_path]
+            try:
+                stats = [os.stat(p) for p in paths]
+                key = (tuple((str(p), st.st_size, st.st_mtime_ns) for p, st in zip(paths, stats)),
+                       args, tuple(sorted(kwargs.items())))
+                with lock:
+                    hit = cache.get(key)
+                    if hit is not None:
+                        cache.move_to_end(key)
+            except (OSError, TypeError):
+                return compute(audio_path, *args, **kwargs)
+            if hit is None:
+                # Encoded outside the lock; a concurrent miss on the same key
+                # just encodes twice
+                hit = compute(audio_path, *args, **kwargs)
+                with lock:
+                    cache[key] = hit
+                    if len(cache) > self.LATENT_CACHE_SIZE:
+                        cache.popitem(last=False)
+            return hit
+        
+        tts_model.get_conditioning_latents = cached
+    
+    def unload(self):
+        """Release the loaded model so its memory can be reclaimed"""
+        with self._latent_lock:
+            self._latent_cache.clear()
+        super().unload()
+    
     def synthesize(self, text: str, output_path: Optional[Union[str, Path]] = None,
                    speaker_wav: Optional[Union[str, Path]] = None,
                    language: str = "hi",
@@ -337,7 +399,7 @@ class XTTSHindi(TTSBase):
                 if use_default_output_dir and not output_path.is_absolute():
                     output_path = Path("output") / "xtts_hindi" / output_path
                 
-                output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(output_path.parent)
                 return_bytes = False
             
             # Synthesize speech
@@ -394,7 +456,7 @@ class XTTSHindi(TTSBase):
             List of paths to generated audio files
         """
         output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(output_dir)
         
         output_paths = []
         for i, text in enumerate(texts):